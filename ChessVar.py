@@ -4,11 +4,134 @@
 # Description: Variant of chess where winner is determined by which player captures all of the opponent's pieces of one
 #               type first. Game does not include castling, en passant, or pawn promotion. King is not a special piece.
 
+import random
+
+# squares are numbered 0-63 starting at a1, moving across a rank (a1, b1 ... h1) and then up the board to h8
+SQUARE_NAMES = [file + rank for rank in '12345678' for file in 'abcdefgh']
+SQUARE_INDEX = {name: index for index, name in enumerate(SQUARE_NAMES)}
+
+# square names laid out the same way as the board, so COORD_NAMES[x][y] is the name of the square at _board[x][y]
+COORD_NAMES = [[file + rank for rank in '12345678'] for file in 'abcdefgh']
+
+# (x, y) steps for each kind of movement
+KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_STEPS = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+ORTHOGONAL_STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DIAGONAL_STEPS = ((1, 1), (1, -1), (-1, -1), (-1, 1))
+SLIDING_STEPS = {'r': ORTHOGONAL_STEPS, 'b': DIAGONAL_STEPS, 'q': ORTHOGONAL_STEPS + DIAGONAL_STEPS}
+
+WHITE_PIECES = ('wp', 'wr', 'wh', 'wb', 'wq', 'wk')
+BLACK_PIECES = ('bp', 'br', 'bh', 'bb', 'bq', 'bk')
+
+# small integer codes for storing a piece in 4 bits, 0 is an empty square
+PIECE_CODES = {piece: code for code, piece in enumerate(('',) + WHITE_PIECES + BLACK_PIECES)}
+CODE_PIECES = ('',) + WHITE_PIECES + BLACK_PIECES
+
+GAME_STATES = ('UNFINISHED', 'WHITE_WON', 'BLACK_WON')
+
+# reasons make_move rejects a move, given by move_error()
+BAD_SQUARE = 'BAD_SQUARE'               # the start or end isn't a square on the board
+GAME_OVER = 'GAME_OVER'                 # the game has already been won
+EMPTY_SQUARE = 'EMPTY_SQUARE'           # there is no piece on the start square
+WRONG_TURN = 'WRONG_TURN'               # the piece belongs to the player who isn't moving
+OWN_PIECE_TARGET = 'OWN_PIECE_TARGET'   # the end square holds one of the player's own pieces, or is the start square
+ILLEGAL_MOVE = 'ILLEGAL_MOVE'           # the piece can't move that way
+
+# result codes returned by move_index(), MOVE_RESULTS[code] is the reason move_error() gives for the same move
+MOVE_OK = 0
+MOVE_BAD_SQUARE = 1
+MOVE_GAME_OVER = 2
+MOVE_EMPTY_SQUARE = 3
+MOVE_WRONG_TURN = 4
+MOVE_OWN_PIECE_TARGET = 5
+MOVE_ILLEGAL = 6
+MOVE_RESULTS = (None, BAD_SQUARE, GAME_OVER, EMPTY_SQUARE, WRONG_TURN, OWN_PIECE_TARGET, ILLEGAL_MOVE)
+
+# flags for move_index()
+CHECK_ONLY = 1      # give the result code without making the move
+
+PIECE_TYPES = {'p': 'pawn', 'r': 'rook', 'h': 'knight', 'b': 'bishop', 'q': 'queen', 'k': 'king'}
+
+# what a move from start to end needs to be legal, by piece type: MOVE_RULES[piece][start * 64 + end]
+UNREACHABLE = 0     # the piece can never move there
+REACHABLE = 1       # the piece can always move there (knights and kings)
+CLEAR_PATH = 2      # every square in between must be empty (sliding pieces)
+EMPTY_TARGET = 3    # the end square must be empty (a pawn's one-square advance)
+EMPTY_PATH = 4      # the end square and every square in between must be empty (a pawn's two-square advance)
+CAPTURE = 5         # the end square must hold a piece (a pawn's diagonal capture)
+
+MOVE_RULES = {piece: bytearray(4096) for piece in PIECE_TYPES.values()}
+
+# BETWEEN_COORDS[start * 64 + end] lists the [x, y] coordinates strictly between two squares on the same line
+BETWEEN_COORDS = [()] * 4096
+
+for _x in range(8):
+    for _y in range(8):
+        _start = _y * 8 + _x
+        for _piece, _steps in (('knight', KNIGHT_STEPS), ('king', KING_STEPS)):
+            for _step_x, _step_y in _steps:
+                if 0 <= _x + _step_x < 8 and 0 <= _y + _step_y < 8:
+                    MOVE_RULES[_piece][_start * 64 + (_y + _step_y) * 8 + _x + _step_x] = REACHABLE
+        for _step_x, _step_y in ORTHOGONAL_STEPS + DIAGONAL_STEPS:
+            _between = []
+            _end_x = _x + _step_x
+            _end_y = _y + _step_y
+            while 0 <= _end_x < 8 and 0 <= _end_y < 8:
+                _move = _start * 64 + _end_y * 8 + _end_x
+                BETWEEN_COORDS[_move] = tuple(_between)
+                MOVE_RULES['queen'][_move] = CLEAR_PATH
+                MOVE_RULES['rook' if (_step_x, _step_y) in ORTHOGONAL_STEPS else 'bishop'][_move] = CLEAR_PATH
+                _between.append((_end_x, _end_y))
+                _end_x += _step_x
+                _end_y += _step_y
+
+        # pawns move one square up or down the file, two from rank 2 up or rank 7 down, and capture on the diagonals
+        for _step_y in (1, -1):
+            if 0 <= _y + _step_y < 8:
+                MOVE_RULES['pawn'][_start * 64 + _start + _step_y * 8] = EMPTY_TARGET
+        if _y == 1 or _y == 6:
+            MOVE_RULES['pawn'][_start * 64 + _start + (16 if _y == 1 else -16)] = EMPTY_PATH
+        for _step_x, _step_y in DIAGONAL_STEPS:
+            if 0 <= _x + _step_x < 8 and 0 <= _y + _step_y < 8:
+                MOVE_RULES['pawn'][_start * 64 + (_y + _step_y) * 8 + _x + _step_x] = CAPTURE
+
+# Zobrist keys, ZOBRIST_KEYS[piece][x][y] for a piece standing on _board[x][y] plus one key for black to move
+#   a fixed seed keeps position keys the same from one run to the next so they can be stored
+_zobrist_random = random.Random(20231205)
+ZOBRIST_KEYS = {piece: [[_zobrist_random.getrandbits(64) for _ in range(8)] for _ in range(8)]
+                for piece in WHITE_PIECES + BLACK_PIECES}
+ZOBRIST_BLACK_TO_MOVE = _zobrist_random.getrandbits(64)
+
+
 class ChessVar:
     """
     This class represents a variant of the game chess.
     """
 
+    __slots__ = ('_board', '_white_count', '_black_count', '_current_turn', '_game_state', '_piece_type', '_key',
+                 '_history')
+
+    # value_dict sets each spot on the board as coordinates for ease of indexing, shared by every game since it never
+    #   changes
+    _value_dict = {
+        'a1': (0, 0), 'a2': (0, 1), 'a3': (0, 2), 'a4': (0, 3), 'a5': (0, 4), 'a6': (0, 5), 'a7': (0, 6),
+        'a8': (0, 7),
+        'b1': (1, 0), 'b2': (1, 1), 'b3': (1, 2), 'b4': (1, 3), 'b5': (1, 4), 'b6': (1, 5), 'b7': (1, 6),
+        'b8': (1, 7),
+        'c1': (2, 0), 'c2': (2, 1), 'c3': (2, 2), 'c4': (2, 3), 'c5': (2, 4), 'c6': (2, 5), 'c7': (2, 6),
+        'c8': (2, 7),
+        'd1': (3, 0), 'd2': (3, 1), 'd3': (3, 2), 'd4': (3, 3), 'd5': (3, 4), 'd6': (3, 5), 'd7': (3, 6),
+        'd8': (3, 7),
+        'e1': (4, 0), 'e2': (4, 1), 'e3': (4, 2), 'e4': (4, 3), 'e5': (4, 4), 'e6': (4, 5), 'e7': (4, 6),
+        'e8': (4, 7),
+        'f1': (5, 0), 'f2': (5, 1), 'f3': (5, 2), 'f4': (5, 3), 'f5': (5, 4), 'f6': (5, 5), 'f7': (5, 6),
+        'f8': (5, 7),
+        'g1': (6, 0), 'g2': (6, 1), 'g3': (6, 2), 'g4': (6, 3), 'g5': (6, 4), 'g6': (6, 5), 'g7': (6, 6),
+        'g8': (6, 7),
+        'h1': (7, 0), 'h2': (7, 1), 'h3': (7, 2), 'h4': (7, 3), 'h5': (7, 4), 'h6': (7, 5), 'h7': (7, 6),
+        'h8': (7, 7)
+    }
+
     def __init__(self):
         # game board
         self._board = [
@@ -22,26 +145,6 @@ class ChessVar:
             ['wr', 'wp', '', '', '', '', 'bp', 'br'],
         ]
 
-        # value_dict sets each spot on the board as coordinates for ease of indexing
-        self._value_dict = {
-            'a1': [0, 0], 'a2': [0, 1], 'a3': [0, 2], 'a4': [0, 3], 'a5': [0, 4], 'a6': [0, 5], 'a7': [0, 6],
-            'a8': [0, 7],
-            'b1': [1, 0], 'b2': [1, 1], 'b3': [1, 2], 'b4': [1, 3], 'b5': [1, 4], 'b6': [1, 5], 'b7': [1, 6],
-            'b8': [1, 7],
-            'c1': [2, 0], 'c2': [2, 1], 'c3': [2, 2], 'c4': [2, 3], 'c5': [2, 4], 'c6': [2, 5], 'c7': [2, 6],
-            'c8': [2, 7],
-            'd1': [3, 0], 'd2': [3, 1], 'd3': [3, 2], 'd4': [3, 3], 'd5': [3, 4], 'd6': [3, 5], 'd7': [3, 6],
-            'd8': [3, 7],
-            'e1': [4, 0], 'e2': [4, 1], 'e3': [4, 2], 'e4': [4, 3], 'e5': [4, 4], 'e6': [4, 5], 'e7': [4, 6],
-            'e8': [4, 7],
-            'f1': [5, 0], 'f2': [5, 1], 'f3': [5, 2], 'f4': [5, 3], 'f5': [5, 4], 'f6': [5, 5], 'f7': [5, 6],
-            'f8': [5, 7],
-            'g1': [6, 0], 'g2': [6, 1], 'g3': [6, 2], 'g4': [6, 3], 'g5': [6, 4], 'g6': [6, 5], 'g7': [6, 6],
-            'g8': [6, 7],
-            'h1': [7, 0], 'h2': [7, 1], 'h3': [7, 2], 'h4': [7, 3], 'h5': [7, 4], 'h6': [7, 5], 'h7': [7, 6],
-            'h8': [7, 7]
-        }
-
         # white_count and black count are initialized to keep track of how many of each piece has been captured
         self._white_count = {'wr': 2, 'wp': 8, 'wh': 2, 'wb': 2, 'wq': 1, 'wk': 1}
         self._black_count = {'br': 2, 'bp': 8, 'bh': 2, 'bb': 2, 'bq': 1, 'bk': 1}
@@ -50,72 +153,265 @@ class ChessVar:
         self._game_state = 'UNFINISHED'
         self._piece_type = ''
 
+        # Zobrist key of the position, updated by make_move
+        self._key = self._compute_key()
+
+        # undo stack for push() and pop(), one record of everything a move changes per pushed move
+        self._history = []
+
     def get_game_state(self):
         """
         Returns one of the game states: ('UNFINISHED', 'WHITE_WON', 'BLACK_WON')
         """
         return self._game_state
 
+    def get_current_turn(self):
+        """
+        Returns the player to move, 'white' or 'black'
+        """
+        return self._current_turn
+
+    def set_position(self, board, current_turn='white', game_state='UNFINISHED'):
+        """
+        Takes as a parameter a board laid out like _board, the player to move and the game state
+        Replaces the current position with it, counting each player's pieces from the board and clearing the undo stack
+        Only the piece types on the board are counted, so a position set up without some type is played with the types
+        it has: capturing the last piece of one of those types wins the game
+        """
+        self._board = [list(column) for column in board]
+        self._white_count = {}
+        self._black_count = {}
+        for column in self._board:
+            for piece in column:
+                if piece != '':
+                    if piece[0] == 'w':
+                        self._white_count[piece] = self._white_count.get(piece, 0) + 1
+                    else:
+                        self._black_count[piece] = self._black_count.get(piece, 0) + 1
+
+        self._current_turn = current_turn
+        self._game_state = game_state
+        self._piece_type = ''
+        self._key = self._compute_key()
+        self._history = []
+
+    def clone(self):
+        """
+        Returns a new game in the same position, sharing nothing that a move changes with this one
+        The undo stack isn't copied, so the clone starts with nothing to pop()
+        """
+        game = self.__class__.__new__(self.__class__)
+        game._board = [column[:] for column in self._board]
+        game._white_count = self._white_count.copy()
+        game._black_count = self._black_count.copy()
+        game._current_turn = self._current_turn
+        game._game_state = self._game_state
+        game._piece_type = self._piece_type
+        game._key = self._key
+        game._history = []
+        return game
+
+    def position_key(self):
+        """
+        Returns the 64-bit Zobrist key of the current position, which is the same for every move order reaching it
+        """
+        return self._key
+
+    def _compute_key(self):
+        """
+        Builds the Zobrist key of the current position from scratch
+        """
+        key = 0
+        for x in range(8):
+            for y in range(8):
+                if self._board[x][y] != '':
+                    key ^= ZOBRIST_KEYS[self._board[x][y]][x][y]
+        if self._current_turn == 'black':
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        return key
+
     def make_move(self, start, end):
         """
         Takes a parameter the intended piece to move and destination
         Returns True or False depending on if a player's move is valid
         """
-        # check if the starting index or ending index exist
+        start_square = SQUARE_INDEX.get(start)
+        end_square = SQUARE_INDEX.get(end)
+        if start_square is None or end_square is None:
+            return False
+        return self.move_index(start_square, end_square) == MOVE_OK
+
+    def move_error(self, start, end):
+        """
+        Takes as a parameter the intended piece to move and destination
+        Returns the reason make_move would reject the move, checked in the same order as make_move, or None if it
+        would accept it. The game isn't changed
+        """
+        start_square = SQUARE_INDEX.get(start)
+        end_square = SQUARE_INDEX.get(end)
+        if start_square is None or end_square is None:
+            return BAD_SQUARE
+        return MOVE_RESULTS[self.move_index(start_square, end_square, CHECK_ONLY)]
+
+    def move_index(self, start, end, flags=0):
+        """
+        Takes as a parameter the start and end square indexes (a1 = 0 through h8 = 63) and optionally CHECK_ONLY to
+        check the move without making it
+        Makes the move and returns MOVE_OK, or returns the result code of the reason the move was rejected
+        """
+        if not 0 <= start < 64 or not 0 <= end < 64:
+            return MOVE_BAD_SQUARE
+
+        # check the game state, if either has won the move is rejected
+        if self._game_state != 'UNFINISHED':
+            return MOVE_GAME_OVER
+
+        start_x = start & 7
+        start_y = start >> 3
+        end_x = end & 7
+        end_y = end >> 3
+        start_piece = self._board[start_x][start_y]
+        end_piece = self._board[end_x][end_y]
+        if start_piece == '':
+            return MOVE_EMPTY_SQUARE
+        elif start_piece[0] != self._current_turn[0]:
+            return MOVE_WRONG_TURN
+        elif start == end or end_piece[:1] == start_piece[0]:
+            return MOVE_OWN_PIECE_TARGET
+
+        self._piece_type = PIECE_TYPES[start_piece[1]]
+        if not self._is_valid_square(start, end, self._piece_type):
+            return MOVE_ILLEGAL
+        if flags & CHECK_ONLY:
+            return MOVE_OK
+
+        # move the piece in the Zobrist key, take out any captured piece and flip the side to move
+        self._key ^= (ZOBRIST_KEYS[start_piece][start_x][start_y] ^ ZOBRIST_KEYS[start_piece][end_x][end_y]
+                      ^ ZOBRIST_BLACK_TO_MOVE)
+        if end_piece != '':
+            self._key ^= ZOBRIST_KEYS[end_piece][end_x][end_y]
+            self.capture_piece(end_piece)
+        self._board[end_x][end_y] = start_piece
+        self._board[start_x][start_y] = ''
+        if end_piece != '':
+            self.check_state()
+        self._current_turn = 'black' if self._current_turn == 'white' else 'white'
+        return MOVE_OK
+
+    def push(self, move):
+        """
+        Takes as a parameter a move as a (start, end) tuple of squares
+        Makes the move like make_move and remembers how to take it back with pop()
+        Returns True or False depending on if the move is valid, invalid moves are not pushed
+        """
+        start, end = move
         if start not in self._value_dict or end not in self._value_dict:
             return False
 
-        # search for the coordinates of start and end in value_dict
         start_coord = self._value_dict[start]
         end_coord = self._value_dict[end]
+        record = (move, self._board[start_coord[0]][start_coord[1]], self._board[end_coord[0]][end_coord[1]],
+                  self._current_turn, self._game_state, self._piece_type, self._key)
+        if self.make_move(start, end):
+            self._history.append(record)
+            return True
+        return False
+
+    def pop(self):
+        """
+        Takes back the last move made with push(), restoring the board, the piece counts, the turn and the game state
+        Returns the move that was taken back
+        """
+        move, start_piece, end_piece, current_turn, game_state, piece_type, key = self._history.pop()
+        start_coord = self._value_dict[move[0]]
+        end_coord = self._value_dict[move[1]]
+        self._board[start_coord[0]][start_coord[1]] = start_piece
+        self._board[end_coord[0]][end_coord[1]] = end_piece
+
+        # put a captured piece back in its player's pile
+        if end_piece != '':
+            if end_piece[0] == 'w':
+                self._white_count[end_piece] += 1
+            else:
+                self._black_count[end_piece] += 1
 
-        # retrieve the appropriate strings from the board nested list
-        start_piece = self._board[start_coord[0]][start_coord[1]]
-        end_piece = self._board[end_coord[0]][end_coord[1]]
-
-        # check the game state, if either has won return False
-        if self._game_state == 'WHITE_WON' or self._game_state == 'BLACK_WON':
-            return False
+        self._current_turn = current_turn
+        self._game_state = game_state
+        self._piece_type = piece_type
+        self._key = key
+        return move
 
-        # check if start piece is empty
-        elif start_piece == '':
-            return False
+    def legal_moves(self):
+        """
+        Yields every legal move for the current player as a (start, end) tuple of squares, for example ('e2', 'e4')
+        Yields nothing once the game has been won
+        """
+        if self._game_state != 'UNFINISHED':
+            return
 
-        # if the start coordinate has a piece, check if the piece belongs to current player and if it does,
-        #   continue otherwise return False
-        elif start_piece[0] != self._current_turn[0]:
-            return False
+        for x in range(8):
+            for y in range(8):
+                piece = self._board[x][y]
+                if piece != '' and piece[0] == self._current_turn[0]:
+                    yield from self._piece_moves(x, y, piece)
 
-        # check to make sure starting position is not also end destination
-        elif start_coord == end_coord:
-            return False
+    def legal_moves_from(self, square):
+        """
+        Takes as a parameter a square such as 'e2'
+        Yields every legal move for the piece on that square, or nothing if it isn't the current player's piece
+        """
+        if square not in self._value_dict or self._game_state != 'UNFINISHED':
+            return
 
-        # check if end piece belongs to other player, if it doesn't return false
-        elif end_piece != '' and start_piece[0] == end_piece[0]:
-            return False
+        x, y = self._value_dict[square]
+        piece = self._board[x][y]
+        if piece != '' and piece[0] == self._current_turn[0]:
+            yield from self._piece_moves(x, y, piece)
 
-        else:
-            # check type of piece by calling check_type()
-            piece = self.check_type(start_piece)
-
-            # check if the move is valid by calling on is_valid()
-            check_valid = self.is_valid(start_coord, end_coord, piece)
-            if check_valid is True:
-                if end_piece == '':
-                    self._board[end_coord[0]][end_coord[1]] = start_piece
-                    self._board[start_coord[0]][start_coord[1]] = ''
-                else:
-                    self.capture_piece(end_piece)
-                    self._board[end_coord[0]][end_coord[1]] = start_piece
-                    self._board[start_coord[0]][start_coord[1]] = ''
-                self.check_state()
-                if self._current_turn == 'white':
-                    self._current_turn = 'black'
-                elif self._current_turn == 'black':
-                    self._current_turn = 'white'
-                return True
-            else:
-                return False
+    def _piece_moves(self, x, y, piece):
+        """
+        Takes as a parameter the coordinates of a piece and the piece string
+        Yields the (start, end) moves the piece can make by walking its steps and rays, following the rules in is_valid
+        """
+        board = self._board
+        start = COORD_NAMES[x][y]
+        color = piece[0]
+
+        if piece[1] in SLIDING_STEPS:
+            for step_x, step_y in SLIDING_STEPS[piece[1]]:
+                end_x = x + step_x
+                end_y = y + step_y
+                while 0 <= end_x < 8 and 0 <= end_y < 8:     # walk the ray until it leaves the board
+                    target = board[end_x][end_y]
+                    if target == '':
+                        yield start, COORD_NAMES[end_x][end_y]
+                    else:
+                        if target[0] != color:      # the first piece on the ray can be captured if it's the opponent's
+                            yield start, COORD_NAMES[end_x][end_y]
+                        break
+                    end_x += step_x
+                    end_y += step_y
+
+        elif piece[1] == 'h' or piece[1] == 'k':
+            for step_x, step_y in KNIGHT_STEPS if piece[1] == 'h' else KING_STEPS:
+                end_x = x + step_x
+                end_y = y + step_y
+                if 0 <= end_x < 8 and 0 <= end_y < 8 and board[end_x][end_y][:1] != color:
+                    yield start, COORD_NAMES[end_x][end_y]
+
+        else:       # pawns move one square up or down the file and capture on any of the four diagonals
+            for step_y in (1, -1):
+                end_y = y + step_y
+                if 0 <= end_y < 8 and board[x][end_y] == '':
+                    yield start, COORD_NAMES[x][end_y]
+                    # pawns on rank 2 may advance two squares up the board and pawns on rank 7 two squares down
+                    if (y == 1 and step_y == 1 or y == 6 and step_y == -1) and board[x][end_y + step_y] == '':
+                        yield start, COORD_NAMES[x][end_y + step_y]
+            for step_x, step_y in DIAGONAL_STEPS:
+                end_x = x + step_x
+                end_y = y + step_y
+                if 0 <= end_x < 8 and 0 <= end_y < 8 and board[end_x][end_y][:1] not in ('', color):
+                    yield start, COORD_NAMES[end_x][end_y]
 
     def check_type(self, piece):
         """
@@ -147,310 +443,29 @@ class ChessVar:
         Takes as a parameter the starting coordinate and ending coordinate, and piece which holds its type
         Checks if a move is valid, including traversing through other pieces which is invalid unless piece is a knight
         """
+        return self._is_valid_square(start[1] * 8 + start[0], end[1] * 8 + end[0], piece)
 
-        # calculates the coordinate change with absolute values taken
-        coord_change = [abs(end[0] - start[0]), abs(end[1] - start[1])]
-        piece_type = piece
-        board = self._board
-
-        if piece_type == 'rook':
-            if start[0] == end[0] or start[1] == end[1]: # if either the "x" or "y" coordinate remain the same from start to end
-                if start[0] == end[0]:    # if only the "y" coordinate changed
-                    if end[1] > start[1]:  # if the end y coordinate is greater than the start y coordinate
-                        value = start[1] + 1
-                        temp = [start[0], value]
-                        while value < end[1]:  # checks values in between
-                            if board[temp[0]][temp[1]] != '':  # rooks can't hop over populated spaces
-                                return False
-                            value += 1     # space is empty so increment the y value to check next spot
-                            temp = [start[0], value]
-                        return True   # no pieces in between start and end so move is valid return True
-                    elif end[1] < start[1]:  # if the end y coordinate is < the start y coordinate
-                        value = start[1] - 1
-                        temp = [start[0], value]
-                        while value > end[1]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value -= 1    # space is empty this time decrement since the end y coord is < start y coord
-                            temp = [start[0], value]  # set temp equal to new coordinates
-                        return True
-                elif start[1] == end[1]:    # if only the "x" coordinate changed
-                    if end[0] > start[0]:
-                        value = start[0] + 1
-                        temp = [value, start[1]]
-                        while value < end[0]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value += 1
-                            temp = [value, start[1]]
-                        return True
-                    elif end[0] < start[0]:
-                        value = start[0] - 1
-                        temp = [value, start[1]]
-                        while value > end[0]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value -= 1
-                            temp = [value, start[1]]
-                        return True
-            else:
-                return False
-
-        elif piece_type == 'bishop':
-            if coord_change[0] == coord_change[1]:      # if the coord change for "x" and "y" are equal
-                if end[0] > start[0] and end[1] > start[1]:     # if "x" and "y" both increase
-                    value1 = start[0] + 1       # increment x
-                    value2 = start[1] + 1       # increment y
-                    temp = [value1, value2]
-                    while value2 < end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 += 1             # increment x
-                        value2 += 1             # increment y
-                        temp = [value1, value2]
-                    return True
-
-                elif end[0] < start[0] and end[1] < start[1]:       # if "x" and "y" both decrease
-                    value1 = start[0] - 1
-                    value2 = start[1] - 1
-                    temp = [value1, value2]
-                    while value2 > end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 -= 1
-                        value2 -= 1
-                        temp = [value1, value2]
-                    return True
-
-                elif end[0] > start[0] and end[1] < start[1]:       # if x increase and y decrease
-                    value1 = start[0] + 1
-                    value2 = start[1] - 1
-                    temp = [value1, value2]
-                    while value2 > end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 += 1
-                        value2 -= 1
-                        temp = [value1, value2]
-                    return True
-
-                elif end[0] < start[0] and end[1] > start[1]:          # if x decrease and y increase
-                    value1 = start[0] - 1
-                    value2 = start[1] + 1
-                    temp = [value1, value2]
-                    while value2 < end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 -= 1
-                        value2 += 1
-                        temp = [value1, value2]
-                    return True
-            else:
-                return False
-
-        elif piece_type == 'queen':         # just copy and paste code from rook and bishop since same movements
-            if start[0] == end[0] or start[1] == end[1]:
-                if start[0] == end[0]:
-                    if end[1] > start[1]:
-                        value = start[1] + 1
-                        temp = [start[0], value]
-                        while value < end[1]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value += 1
-                            temp = [start[0], value]
-                        return True
-                    elif end[1] < start[1]:
-                        value = start[1] - 1
-                        temp = [start[0], value]
-                        while value > end[1]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value -= 1
-                            temp = [start[0], value]
-                        return True
-                elif start[1] == end[1]:
-                    if end[0] > start[0]:
-                        value = start[0] + 1
-                        temp = [value, start[1]]
-                        while value < end[0]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value += 1
-                            temp = [value, start[1]]
-                        return True
-                    elif end[0] < start[0]:
-                        value = start[0] - 1
-                        temp = [value, start[1]]
-                        while value > end[0]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value -= 1
-                            temp = [value, start[1]]
-                        return True
-            elif coord_change[0] == coord_change[1]:
-                if end[0] > start[0] and end[1] > start[1]:
-                    value1 = start[0] + 1
-                    value2 = start[1] + 1
-                    temp = [value1, value2]
-                    while value2 < end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 += 1
-                        value2 += 1
-                        temp = [value1, value2]
-                    return True
-
-                elif end[0] < start[0] and end[1] < start[1]:
-                    value1 = start[0] - 1
-                    value2 = start[1] - 1
-                    temp = [value1, value2]
-                    while value2 > end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 -= 1
-                        value2 -= 1
-                        temp = [value1, value2]
-                    return True
-
-                elif end[0] > start[0] and end[1] < start[1]:
-                    value1 = start[0] + 1
-                    value2 = start[1] - 1
-                    temp = [value1, value2]
-                    while value2 > end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 += 1
-                        value2 -= 1
-                        temp = [value1, value2]
-                    return True
-
-                elif end[0] < start[0] and end[1] > start[1]:
-                    value1 = start[0] - 1
-                    value2 = start[1] + 1
-                    temp = [value1, value2]
-                    while value2 < end[1]:
-                        if board[temp[0]][temp[1]] != '':
-                            return False
-                        value1 -= 1
-                        value2 += 1
-                        temp = [value1, value2]
-                    return True
-            else:
-                return False
-
-        elif piece_type == 'knight':
-            if coord_change == [1, 2] or coord_change == [2, 1]:     # coord change will always be [1,2] or [2,1]
-                return True         # knights can hop, no need to check in between
-            else:
-                return False
+    def _is_valid_square(self, start, end, piece):
+        """
+        Takes as a parameter the starting and ending square indexes and piece which holds its type
+        Checks if a move is valid by looking up what the move needs in MOVE_RULES
+        """
+        rule = MOVE_RULES[piece][start * 64 + end]
+        if rule == REACHABLE:
+            return True
+        elif rule == UNREACHABLE:
+            return False
 
-        elif piece_type == 'king':
-            if coord_change == [1, 1] or coord_change == [0, 1] or coord_change == [1, 0]:  # always one of these coords
-                return True     # kings only move one space and can capture in any direction, so no in between checks
-            else:
-                return False
-
-        else:       # these valid checks are for th pawn piece, the last piece not defined yet
-            if start[1] == 1 or start[1] == 6:  # for pawns who have not made their first move yet
-                if coord_change == [0, 1] or coord_change == [0, 2]:       # for pawns that move forward 1 or 2 spaces
-                    if end[0] == start[0] and end[1] < start[1]:
-                        value1 = start[0]
-                        value2 = start[1] - 1
-                        temp = [value1, value2]
-                        while value2 >= end[1]:
-                            if board[temp[0]][temp[1]] != '':      # since pawns can only diagonal capture, spaces in between must be empty
-                                return False
-                            value2 -= 1
-                            temp = [value1, value2]
-                        return True
-                    elif end[0] == start[0] and end[1] > start[1]:
-                        value1 = start[0]
-                        value2 = start[1] + 1
-                        temp = [value1, value2]
-                        while value2 <= end[1]:
-                            if board[temp[0]][temp[1]] != '':
-                                return False
-                            value2 += 1
-                            temp = [value1, value2]
-                        return True
-                elif coord_change == [1, 1]:        # for pawns that try to move diagonally
-                    if end[0] < start[0] and end[1] < start[1]:
-                        value1 = start[0] - 1
-                        value2 = start[1] - 1
-                        temp = [value1, value2]
-                        if board[temp[0]][temp[1]] == '':   # spaces must contain opponent's piece since pawns can't move diagonally unless its a capture
-                            return False
-                        return True
-                    elif end[0] > start[0] and end[1] < start[1]:
-                        value1 = start[0] + 1
-                        value2 = start[1] - 1
-                        temp = [value1, value2]
-                        if board[temp[0]][temp[1]] == '':
-                            return False
-                        return True
-                    elif end[0] < start[0] and end[1] > start[1]:
-                        value1 = start[0] - 1
-                        value2 = start[1] + 1
-                        temp = [value1, value2]
-                        if board[temp[0]][temp[1]] == '':
-                            return False
-                        return True
-                    elif end[0] > start[0] and end[1] > start[1]:
-                        value1 = start[0] + 1
-                        value2 = start[1] + 1
-                        temp = [value1, value2]
-                        if board[temp[0]][temp[1]] == '':
-                            return False
-                        return True
-                else:
+        board = self._board
+        if rule == CLEAR_PATH or rule == EMPTY_PATH:
+            for x, y in BETWEEN_COORDS[start * 64 + end]:
+                if board[x][y] != '':
                     return False
-            elif coord_change == [0, 1]:            # for pawns that have already made their first move and want to move forward
-                if end[0] == start[0] and end[1] < start[1]:
-                    value1 = start[0]
-                    value2 = start[1] - 1
-                    temp = [value1, value2]
-                    if board[temp[0]][temp[1]] != '':
-                        return False
-                    return True
-                elif end[0] == start[0] and end[1] > start[1]:
-                    value1 = start[0]
-                    value2 = start[1] + 1
-                    temp = [value1, value2]
-                    if board[temp[0]][temp[1]] != '':
-                        return False
-                    return True
-            elif coord_change == [1, 1]:            # for pawns that have already made their first move and want to mvoe diagonally
-                if end[0] < start[0] and end[1] < start[1]:
-                    value1 = start[0] - 1
-                    value2 = start[1] - 1
-                    temp = [value1, value2]
-                    if board[temp[0]][temp[1]] == '':
-                        return False
-                    return True
-                elif end[0] > start[0] and end[1] < start[1]:
-                    value1 = start[0] + 1
-                    value2 = start[1] - 1
-                    temp = [value1, value2]
-                    if board[temp[0]][temp[1]] == '':
-                        return False
-                    return True
-                elif end[0] < start[0] and end[1] > start[1]:
-                    value1 = start[0] - 1
-                    value2 = start[1] + 1
-                    temp = [value1, value2]
-                    if board[temp[0]][temp[1]] == '':
-                        return False
-                    return True
-                elif end[0] > start[0] and end[1] > start[1]:
-                    value1 = start[0] + 1
-                    value2 = start[1] + 1
-                    temp = [value1, value2]
-                    if board[temp[0]][temp[1]] == '':
-                        return False
-                    return True
-            else:
-                return False
+            if rule == CLEAR_PATH:
+                return True
+        if rule == CAPTURE:     # pawns only move diagonally to capture
+            return board[end & 7][end >> 3] != ''
+        return board[end & 7][end >> 3] == ''
 
     def capture_piece(self, end_piece):
         """
@@ -0,0 +1,221 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: ChessVar backend that keeps attack maps. make_move updates the squares each piece attacks, each side's
+#               attacked squares and each side's piece types with one piece left, so asking whether a square is
+#               attacked or whether a player can win with a capture doesn't generate any moves.
+
+from ChessVar import SQUARE_NAMES, SQUARE_INDEX, MOVE_OK, CHECK_ONLY
+from bitboard import BitboardChessVar, KNIGHT_MASKS, KING_MASKS, PAWN_CAPTURE_MASKS, sliding_attacks
+
+SLIDING_PIECES = ('wr', 'wb', 'wq', 'br', 'bb', 'bq')
+
+
+def attack_mask(piece, square, occupied):
+    """
+    Takes as a parameter a piece string, its square index and the mask of occupied squares
+    Returns the mask of squares the piece attacks, the squares it could capture on if an opponent's piece stood there
+    """
+    letter = piece[1]
+    if letter == 'h':
+        return KNIGHT_MASKS[square]
+    elif letter == 'k':
+        return KING_MASKS[square]
+    elif letter == 'p':
+        return PAWN_CAPTURE_MASKS[square]
+    return sliding_attacks(square, letter, occupied)
+
+
+def _square_names(mask):
+    """
+    Takes as a parameter a mask of squares
+    Returns the list of their names from a1 to h8
+    """
+    names = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        names.append(SQUARE_NAMES[bit.bit_length() - 1])
+    return names
+
+
+class AttackMapChessVar(BitboardChessVar):
+    """
+    This class represents a ChessVar game that also keeps the squares attacked from every square, each player's
+    attacked squares and each player's piece types that are down to one piece.
+    """
+
+    __slots__ = ('_attacks', '_attacked', '_last_pieces')
+
+    def __init__(self):
+        super().__init__()
+        self._build_attacks()
+
+    def set_position(self, board, current_turn='white', game_state='UNFINISHED'):
+        """
+        Takes as a parameter a board laid out like _board, the player to move and the game state
+        Replaces the current position with it and rebuilds the attack maps
+        """
+        super().set_position(board, current_turn, game_state)
+        self._build_attacks()
+
+    def clone(self):
+        """
+        Returns a new game in the same position, with its own copy of the attack maps
+        """
+        game = super().clone()
+        game._attacks = self._attacks[:]
+        game._attacked = self._attacked.copy()
+        game._last_pieces = self._last_pieces.copy()
+        return game
+
+    def _build_attacks(self):
+        """
+        Builds the attack maps and the index of last pieces from the board
+        """
+        # _attacks[square] is the mask of squares attacked by the piece on square, 0 for an empty square
+        occupied = self._occupied['w'] | self._occupied['b']
+        self._attacks = [0] * 64
+        for square in range(64):
+            piece = self._board[square & 7][square >> 3]
+            if piece != '':
+                self._attacks[square] = attack_mask(piece, square, occupied)
+        self._attacked = {'w': 0, 'b': 0}
+        self._update_attacked()
+        self._last_pieces = {'w': self._find_last_pieces('w'), 'b': self._find_last_pieces('b')}
+
+    def _find_last_pieces(self, color):
+        """
+        Takes as a parameter a color letter, 'w' or 'b'
+        Returns a tuple of that player's piece types with exactly one piece left
+        """
+        counts = self._white_count if color == 'w' else self._black_count
+        return tuple(piece for piece, count in counts.items() if count == 1)
+
+    def _update_attacked(self):
+        """
+        Rebuilds each player's attacked squares from the attacks of their pieces
+        """
+        for color in 'wb':
+            attacked = 0
+            own = self._occupied[color]
+            while own:
+                bit = own & -own
+                own ^= bit
+                attacked |= self._attacks[bit.bit_length() - 1]
+            self._attacked[color] = attacked
+
+    def _update_attacks(self, start, end):
+        """
+        Takes as a parameter the two square indexes a move changed
+        Updates the attacks from both squares, and from every sliding piece whose rays reached either of them
+        """
+        occupied = self._occupied['w'] | self._occupied['b']
+        attacks = self._attacks
+        for square in (start, end):
+            piece = self._board[square & 7][square >> 3]
+            attacks[square] = attack_mask(piece, square, occupied) if piece != '' else 0
+
+        # a ray that reached a square the move emptied now runs further, and one that reached a square the move
+        #   filled now stops there
+        changed = 1 << start | 1 << end
+        for piece in SLIDING_PIECES:
+            pieces = self._bitboards[piece] & ~changed
+            while pieces:
+                bit = pieces & -pieces
+                pieces ^= bit
+                square = bit.bit_length() - 1
+                if attacks[square] & changed:
+                    attacks[square] = sliding_attacks(square, piece[1], occupied)
+        self._update_attacked()
+
+    def move_index(self, start, end, flags=0):
+        """
+        Takes as a parameter the start and end square indexes (a1 = 0 through h8 = 63) and optionally CHECK_ONLY to
+        check the move without making it
+        Makes the move, updating the attack maps, and returns MOVE_OK, or returns the result code of the reason the
+        move was rejected
+        """
+        end_piece = self._board[end & 7][end >> 3] if 0 <= end < 64 else ''
+        result = super().move_index(start, end, flags)
+        if result != MOVE_OK or flags & CHECK_ONLY:
+            return result
+
+        self._update_attacks(start, end)
+        if end_piece != '':
+            self._last_pieces[end_piece[0]] = self._find_last_pieces(end_piece[0])
+        return MOVE_OK
+
+    def pop(self):
+        """
+        Takes back the last move made with push(), restoring the attack maps along with the bitboards
+        Returns the move that was taken back
+        """
+        move = super().pop()
+        end_square = SQUARE_INDEX[move[1]]
+        self._update_attacks(SQUARE_INDEX[move[0]], end_square)
+        end_piece = self._board[end_square & 7][end_square >> 3]
+        if end_piece != '':
+            self._last_pieces[end_piece[0]] = self._find_last_pieces(end_piece[0])
+        return move
+
+    def is_attacked(self, square, color):
+        """
+        Takes as a parameter a square such as 'e4' and a player, 'white' or 'black'
+        Returns True if one of that player's pieces attacks the square
+        """
+        return bool(self._attacked[color[0]] >> SQUARE_INDEX[square] & 1)
+
+    def attacked_squares(self, color):
+        """
+        Takes as a parameter a player, 'white' or 'black'
+        Returns the list of squares that player's pieces attack, including squares holding their own pieces
+        """
+        return _square_names(self._attacked[color[0]])
+
+    def attacks_from(self, square):
+        """
+        Takes as a parameter a square such as 'e4'
+        Returns the list of squares attacked by the piece on it, or an empty list if the square is empty
+        """
+        return _square_names(self._attacks[SQUARE_INDEX[square]])
+
+    def attackers(self, square, color):
+        """
+        Takes as a parameter a square such as 'e4' and a player, 'white' or 'black'
+        Returns the list of squares holding that player's pieces that attack the square
+        """
+        bit = 1 << SQUARE_INDEX[square]
+        if not self._attacked[color[0]] & bit:
+            return []
+        own = self._occupied[color[0]]
+        return [name for name in _square_names(own) if self._attacks[SQUARE_INDEX[name]] & bit]
+
+    def last_pieces(self, color):
+        """
+        Takes as a parameter a player, 'white' or 'black'
+        Returns the list of that player's piece types with one piece left, such as ['wq', 'wk']
+        """
+        return list(self._last_pieces[color[0]])
+
+    def winning_captures(self, color=None):
+        """
+        Takes as a parameter a player, 'white' or 'black', or None for the player to move
+        Returns the list of (start, end) captures that would take the other player's last piece of a type and win the
+        game if it were that player's move. Returns an empty list once the game is over
+        """
+        if self._game_state != 'UNFINISHED':
+            return []
+        color = (color or self._current_turn)[0]
+        opponent = 'b' if color == 'w' else 'w'
+        targets = 0
+        for piece in self._last_pieces[opponent]:
+            targets |= self._bitboards[piece]
+        if not self._attacked[color] & targets:
+            return []
+
+        captures = []
+        for start in _square_names(self._occupied[color]):
+            for end in _square_names(self._attacks[SQUARE_INDEX[start]] & targets):
+                captures.append((start, end))
+        return captures
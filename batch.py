@@ -0,0 +1,87 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Batched move validation with NumPy. Many positions are held in one (N, 8, 8) int8 array of piece codes
+#               and legal_mask() checks one move per position with array operations, applying the same rules as
+#               ChessVar.make_move and is_valid, blocked rays included. Needs numpy.
+
+import numpy as np
+
+from ChessVar import (SQUARE_INDEX, PIECE_CODES, GAME_STATES, PIECE_TYPES, MOVE_RULES as PIECE_MOVE_RULES, REACHABLE,
+                      CLEAR_PATH, EMPTY_TARGET, EMPTY_PATH, CAPTURE)
+from bitboard import BETWEEN
+
+# piece kinds, in the order of the codes in PIECE_CODES, so a piece code's kind is (code - 1) % 6
+PAWN, ROOK, KNIGHT, BISHOP, QUEEN, KING = range(6)
+
+# what a move from start to end needs to be legal, by piece kind: MOVE_RULES[kind, start, end] is one of the rules
+#   ChessVar.MOVE_RULES uses
+MOVE_RULES = np.array([PIECE_MOVE_RULES[PIECE_TYPES[letter]] for letter in 'prhbqk'],
+                      dtype=np.uint8).reshape(6, 64, 64)
+
+# BETWEEN_BITS[start * 64 + end] has a bit set for each square strictly between two squares on the same line
+BETWEEN_BITS = np.array(BETWEEN, dtype=np.uint64)
+
+# CODE_COLORS[code] is the player a piece code belongs to (-1 for an empty square) and CODE_KINDS[code] its kind
+CODE_COLORS = np.array([-1] + [0] * 6 + [1] * 6, dtype=np.int8)
+CODE_KINDS = np.array([0] + list(range(6)) * 2, dtype=np.intp)
+
+
+def boards_from_games(games):
+    """
+    Takes as a parameter a list of N ChessVar games
+    Returns (boards, turns, states): an (N, 8, 8) int8 array of piece codes indexed [game, rank, file], an (N,) int8
+    array of the player to move (0 white, 1 black) and an (N,) int8 array of GAME_STATES indexes
+    """
+    boards = np.zeros((len(games), 8, 8), dtype=np.int8)
+    turns = np.zeros(len(games), dtype=np.int8)
+    states = np.zeros(len(games), dtype=np.int8)
+    for number, game in enumerate(games):
+        for x in range(8):
+            for y in range(8):
+                boards[number, y, x] = PIECE_CODES[game._board[x][y]]
+        turns[number] = game._current_turn == 'black'
+        states[number] = GAME_STATES.index(game._game_state)
+    return boards, turns, states
+
+
+def square_indexes(squares):
+    """
+    Takes as a parameter a list of square names such as 'e2'
+    Returns an int array of their indexes, a1 = 0 through h8 = 63
+    """
+    return np.array([SQUARE_INDEX[square] for square in squares], dtype=np.intp)
+
+
+def legal_mask(boards, turns, starts, ends, states=None):
+    """
+    Takes as a parameter an (N, 8, 8) array of piece codes, an (N,) array of the player to move, (N,) arrays of start
+    and end square indexes, and optionally an (N,) array of game states (all unfinished if None)
+    Returns an (N,) boolean array, True where make_move would accept the move in that position
+    """
+    count = len(boards)
+    squares = boards.reshape(count, 64)
+    rows = np.arange(count)
+    starts = np.asarray(starts, dtype=np.intp)
+    ends = np.asarray(ends, dtype=np.intp)
+
+    piece = squares[rows, starts]
+    target = squares[rows, ends]
+
+    # the start square must hold a piece of the player to move and the end square must not
+    legal = CODE_COLORS[piece] == turns
+    legal &= CODE_COLORS[target] != turns
+    if states is not None:
+        legal &= np.asarray(states) == 0
+
+    # one bit per occupied square, a1 as the lowest bit, to test the squares a move passes through all at once
+    occupied = np.packbits(squares != 0, axis=1, bitorder='little').view('<u8').ravel()
+
+    rule = MOVE_RULES[CODE_KINDS[piece], starts, ends]
+    clear = BETWEEN_BITS[starts * 64 + ends] & occupied == 0
+    empty = target == 0
+    return legal & ((rule == REACHABLE)
+                    | ((rule == CLEAR_PATH) & clear)
+                    | ((rule == EMPTY_TARGET) & empty)
+                    | ((rule == EMPTY_PATH) & clear & empty)
+                    | ((rule == CAPTURE) & ~empty))
@@ -0,0 +1,368 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Benchmarks for ChessVar. Run with "python benchmarks.py <name>" where name is one of the functions
+#               listed in BENCHMARKS.
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from ChessVar import ChessVar, SQUARE_INDEX, MOVE_OK
+from attacks import AttackMapChessVar
+from bitboard import BitboardChessVar, SQUARE_NAMES
+from session import GameSession
+
+
+def _move_attempts(count, seed):
+    """
+    Takes as a parameter the number of attempts and a random seed
+    Returns a list of (start, end) square pairs, the same list every time for the same seed
+    Each start square holds a piece of the player to move, so the attempts reach is_valid like a real client's would
+    """
+    rng = random.Random(seed)
+    attempts = []
+    game = ChessVar()
+    while len(attempts) < count:
+        turn = game._current_turn[0]
+        own = [name for name in SQUARE_NAMES if game._board[ord(name[0]) - 97][int(name[1]) - 1][:1] == turn]
+        start, end = rng.choice(own), rng.choice(SQUARE_NAMES)
+        attempts.append((start, end))
+        game.make_move(start, end)
+        if game.get_game_state() != 'UNFINISHED':
+            game = ChessVar()
+    return attempts
+
+
+def _replay_attempts(game_class, attempts):
+    """
+    Takes as a parameter a ChessVar class and a list of (start, end) pairs
+    Feeds every pair to make_move, starting a new game whenever one is won, and returns the list of results
+    """
+    results = []
+    game = game_class()
+    for start, end in attempts:
+        results.append(game.make_move(start, end))
+        if game.get_game_state() != 'UNFINISHED':
+            game = game_class()
+    return results
+
+
+def bench_backends(count=200000, seed=0):
+    """
+    Takes as a parameter the number of move attempts and a random seed
+    Times the list backend against the bitboard backend on the same attempts and checks they agree
+    """
+    attempts = _move_attempts(count, seed)
+    timings = {}
+    results = {}
+    for name, game_class in (('list', ChessVar), ('bitboard', BitboardChessVar)):
+        begin = time.perf_counter()
+        results[name] = _replay_attempts(game_class, attempts)
+        timings[name] = time.perf_counter() - begin
+        print(f'{name:>10}: {count / timings[name]:12,.0f} move checks/s  '
+              f'({results[name].count(True)} accepted)')
+
+    if results['list'] != results['bitboard']:
+        raise AssertionError('bitboard backend disagrees with the list backend')
+    print(f'   speedup: {timings["list"] / timings["bitboard"]:.2f}x')
+
+
+def _scan_winning_captures(game):
+    """
+    Takes as a parameter a ChessVar game
+    Returns the list of legal captures of the opponent's last piece of a type, found by generating every move
+    """
+    counts = game._black_count if game._current_turn == 'white' else game._white_count
+    captures = []
+    for start, end in game.legal_moves():
+        target = game._board[ord(end[0]) - 97][int(end[1]) - 1]
+        if target != '' and counts[target] == 1:
+            captures.append((start, end))
+    return captures
+
+
+def bench_attacks(count=200000, seed=0):
+    """
+    Takes as a parameter the number of move attempts and a random seed
+    Times make_move with and without attack maps, then finding the winning captures in every position reached from
+    the attack maps against generating every move
+    """
+    attempts = _move_attempts(count, seed)
+    for name, game_class in (('bitboard', BitboardChessVar), ('attacks', AttackMapChessVar)):
+        begin = time.perf_counter()
+        _replay_attempts(game_class, attempts)
+        print(f'{name:>10}: {count / (time.perf_counter() - begin):12,.0f} move checks/s')
+
+    games = []
+    game = AttackMapChessVar()
+    for start, end in attempts:
+        if game.make_move(start, end):
+            if game.get_game_state() != 'UNFINISHED':
+                game = AttackMapChessVar()
+            games.append(game.clone())
+
+    begin = time.perf_counter()
+    scanned = [sorted(_scan_winning_captures(position)) for position in games]
+    scan_time = time.perf_counter() - begin
+    begin = time.perf_counter()
+    indexed = [sorted(position.winning_captures()) for position in games]
+    index_time = time.perf_counter() - begin
+    if scanned != indexed:
+        raise AssertionError('winning_captures disagrees with the legal moves')
+    print(f'      scan: {len(games) / scan_time:12,.0f} winning capture queries/s')
+    print(f'     index: {len(games) / index_time:12,.0f} winning capture queries/s')
+
+
+def bench_instrument(count=200000, seed=0):
+    """
+    Takes as a parameter the number of move attempts and a random seed
+    Times both backends with instrumentation off and on, and prints what it recorded
+    """
+    import instrument
+
+    attempts = _move_attempts(count, seed)
+    for name, game_class in (('list', ChessVar), ('bitboard', BitboardChessVar)):
+        for state in ('off', 'on'):
+            if state == 'on':
+                instrument.enable(game_class)
+            begin = time.perf_counter()
+            _replay_attempts(game_class, attempts)
+            elapsed = time.perf_counter() - begin
+            instrument.disable()
+            print(f'{name:>10} instrumentation {state:>3}: {count / elapsed:12,.0f} move checks/s')
+    print(instrument.to_prometheus(), end='')
+
+
+def bench_index(count=200000, seed=0):
+    """
+    Takes as a parameter the number of move attempts and a random seed
+    Times make_move with square names against move_index with square indexes on every backend
+    """
+    attempts = _move_attempts(count, seed)
+    indexes = [(SQUARE_INDEX[start], SQUARE_INDEX[end]) for start, end in attempts]
+    for name, game_class in (('list', ChessVar), ('bitboard', BitboardChessVar), ('session', GameSession)):
+        begin = time.perf_counter()
+        expected = _replay_attempts(game_class, attempts)
+        name_time = time.perf_counter() - begin
+
+        results = []
+        game = game_class()
+        begin = time.perf_counter()
+        for start, end in indexes:
+            results.append(game.move_index(start, end) == MOVE_OK)
+            if game.get_game_state() != 'UNFINISHED':
+                game = game_class()
+        index_time = time.perf_counter() - begin
+        if results != expected:
+            raise AssertionError(f'{name} move_index disagrees with make_move')
+        print(f'{name:>10}: {count / name_time:12,.0f} make_move/s  {count / index_time:12,.0f} move_index/s  '
+              f'({name_time / index_time:.2f}x)')
+
+
+def bench_book(count=2000, seed=0):
+    """
+    Takes as a parameter the number of random games to build a book from and a random seed
+    Times probing the book against searching the same opening positions with the engine
+    """
+    import os
+    import tempfile
+
+    from book import OpeningBook, count_moves, write_book, BOOK_PLIES
+    from engine import ChessVarEngine
+    from selfplay import play_game
+
+    games = []
+    for index in range(count):
+        record = play_game(index, seed)
+        games.append(([(move[:2], move[2:]) for move in record['moves'].split()], record['result']))
+    positions = []
+    for moves, _ in games[:50]:
+        game = BitboardChessVar()
+        for move in moves[:BOOK_PLIES - 2]:
+            game.make_move(*move)
+            positions.append(game.clone())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'openings.cvbk')
+        write_book(path, count_moves(games), BOOK_PLIES)
+        with OpeningBook(path) as book:
+            begin = time.perf_counter()
+            found = sum(bool(book.probe(position)) for position in positions)
+            probe_time = time.perf_counter() - begin
+            print(f'    probe: {len(positions) / probe_time:12,.0f} positions/s  ({found} of {len(positions)} in book)')
+
+    engine = ChessVarEngine(max_depth=3)
+    begin = time.perf_counter()
+    for position in positions:
+        engine.search(position)
+    search_time = time.perf_counter() - begin
+    print(f'   search: {len(positions) / search_time:12,.1f} positions/s  (depth 3)')
+
+
+def bench_cache(count=200000, seed=0):
+    """
+    Takes as a parameter the number of queries and a random seed
+    Times legal move and move check queries spread over a few common positions with and without a MoveCache, on
+    both backends
+    """
+    from movecache import MoveCache
+
+    rng = random.Random(seed)
+    positions = []
+    game = BitboardChessVar()
+    for start, end in _move_attempts(2000, seed):
+        if game.make_move(start, end):
+            if game.get_game_state() != 'UNFINISHED' or len(positions) == 100:
+                break
+            positions.append(game.clone())
+    # clients mostly ask about moves that are legal or nearly so, the moves of the pieces they are looking at
+    moves = {id(position): [(start, end) for start, _ in position.legal_moves() for end in SQUARE_NAMES[::3]]
+             for position in positions}
+    queries = []
+    for _ in range(count):
+        position = rng.choice(positions)
+        queries.append((position,) + rng.choice(moves[id(position)]))
+
+    for backend, game_class in (('list', ChessVar), ('bitboard', BitboardChessVar)):
+        games = {}
+        for position in positions:
+            games[id(position)] = game_class()
+            games[id(position)].set_position(position._board, position._current_turn)
+        backend_queries = [(games[id(position)], start, end) for position, start, end in queries]
+        cache = MoveCache()
+        for name, legal_moves, is_valid in (
+                ('uncached', lambda position: tuple(position.legal_moves()),
+                 lambda position, start, end: position.move_error(start, end) is None),
+                ('cached', cache.legal_moves, cache.is_valid)):
+            begin = time.perf_counter()
+            for position, _, _ in backend_queries:
+                legal_moves(position)
+            moves_time = time.perf_counter() - begin
+            begin = time.perf_counter()
+            for position, start, end in backend_queries:
+                is_valid(position, start, end)
+            check_time = time.perf_counter() - begin
+            print(f'{backend:>8} {name:>8}: {count / moves_time:12,.0f} legal move lists/s  '
+                  f'{count / check_time:12,.0f} move checks/s')
+    print(f'  last cache: {cache.stats()}')
+
+
+def _bytes_per_game(make_game, count):
+    """
+    Takes as a parameter a function returning a new game and the number of games to keep alive at once
+    Returns the average number of bytes each live game takes
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = [make_game() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del games
+    return used / count
+
+
+def bench_memory(count=100000):
+    """
+    Takes as a parameter the number of live games
+    Prints the bytes each game takes with that many games alive
+    """
+    for name, make_game in (('ChessVar', ChessVar), ('BitboardChessVar', BitboardChessVar),
+                            ('GameSession', GameSession)):
+        print(f'{name:>16}: {_bytes_per_game(make_game, count):10,.0f} bytes/game at {count:,} live games')
+
+
+def bench_batch(count=200000, seed=0):
+    """
+    Takes as a parameter the number of move checks and a random seed
+    Times batch.legal_mask against make_move on the same positions and moves and checks they agree. Needs numpy
+    """
+    from batch import boards_from_games, legal_mask, square_indexes
+
+    rng = random.Random(seed)
+    games = []
+    moves = []
+    game = BitboardChessVar()
+    for start, end in _move_attempts(count, seed):
+        games.append(game.clone())
+        moves.append((start, rng.choice(SQUARE_NAMES) if rng.random() < 0.5 else end))
+        game.make_move(start, end)
+        if game.get_game_state() != 'UNFINISHED':
+            game = BitboardChessVar()
+
+    boards, turns, states = boards_from_games(games)
+    starts = square_indexes([start for start, _ in moves])
+    ends = square_indexes([end for _, end in moves])
+
+    begin = time.perf_counter()
+    expected = [position.make_move(start, end) for position, (start, end) in zip(games, moves)]
+    loop_time = time.perf_counter() - begin
+    print(f' make_move: {count / loop_time:12,.0f} move checks/s  ({expected.count(True)} accepted)')
+
+    begin = time.perf_counter()
+    mask = legal_mask(boards, turns, starts, ends, states)
+    batch_time = time.perf_counter() - begin
+    print(f'legal_mask: {count / batch_time:12,.0f} move checks/s  ({int(mask.sum())} accepted)')
+
+    if mask.tolist() != expected:
+        raise AssertionError('legal_mask disagrees with make_move')
+    print(f'   speedup: {loop_time / batch_time:.2f}x')
+
+
+def bench_playouts(count=200, seed=0):
+    """
+    Takes as a parameter the number of random playouts and a random seed
+    Times random playouts from the starting position played with make_move against the MCTS playout kernel. Both pick
+    uniformly among the legal moves and stop after MAX_PLIES, so their playouts are the same length on average
+    """
+    from mcts import MAX_PLIES, random_playout
+    from session import START_BOARD, START_COUNTS
+
+    rng = random.Random(seed)
+    plies = 0
+    begin = time.perf_counter()
+    for _ in range(count):
+        game = BitboardChessVar()
+        for _ in range(MAX_PLIES):
+            moves = list(game.legal_moves())
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves))
+            plies += 1
+            if game.get_game_state() != 'UNFINISHED':
+                break
+    loop_time = time.perf_counter() - begin
+    print(f' make_move: {count / loop_time:10,.1f} playouts/s  {plies / loop_time:12,.0f} plies/s')
+
+    rng = random.Random(seed)
+    begin = time.perf_counter()
+    for _ in range(count):
+        random_playout(bytearray(START_BOARD), bytearray(START_COUNTS), 0, rng)
+    kernel_time = time.perf_counter() - begin
+    print(f'    kernel: {count / kernel_time:10,.1f} playouts/s')
+    print(f'   speedup: {loop_time / kernel_time:.2f}x')
+
+
+BENCHMARKS = {
+    'attacks': bench_attacks,
+    'backends': bench_backends,
+    'batch': bench_batch,
+    'book': bench_book,
+    'cache': bench_cache,
+    'index': bench_index,
+    'instrument': bench_instrument,
+    'memory': bench_memory,
+    'playouts': bench_playouts,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run ChessVar benchmarks.')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark]()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Bitboard backend for ChessVar. Each piece type and color is kept as one 64-bit integer and moves are
+#               checked against precomputed knight, king, pawn and sliding ray masks instead of walking the board.
+
+from ChessVar import (ChessVar, SQUARE_NAMES, SQUARE_INDEX, KNIGHT_STEPS, KING_STEPS, ORTHOGONAL_STEPS,
+                      DIAGONAL_STEPS, SLIDING_STEPS, WHITE_PIECES, BLACK_PIECES, ZOBRIST_KEYS, ZOBRIST_BLACK_TO_MOVE,
+                      PIECE_TYPES, MOVE_OK, MOVE_BAD_SQUARE, MOVE_GAME_OVER, MOVE_EMPTY_SQUARE, MOVE_WRONG_TURN,
+                      MOVE_OWN_PIECE_TARGET, MOVE_ILLEGAL, CHECK_ONLY)
+
+
+def _step_mask(square, steps):
+    """
+    Takes as a parameter a square index and a tuple of (file, rank) steps
+    Returns a mask of every square one step away that is still on the board
+    """
+    mask = 0
+    for file_step, rank_step in steps:
+        file = (square & 7) + file_step
+        rank = (square >> 3) + rank_step
+        if 0 <= file < 8 and 0 <= rank < 8:
+            mask |= 1 << (rank * 8 + file)
+    return mask
+
+
+def _ray_mask(square, step):
+    """
+    Takes as a parameter a square index and a single (file, rank) step
+    Returns a mask of every square along that direction up to the edge of the board
+    """
+    mask = 0
+    file = (square & 7) + step[0]
+    rank = (square >> 3) + step[1]
+    while 0 <= file < 8 and 0 <= rank < 8:
+        mask |= 1 << (rank * 8 + file)
+        file += step[0]
+        rank += step[1]
+    return mask
+
+
+KNIGHT_MASKS = [_step_mask(square, KNIGHT_STEPS) for square in range(64)]
+KING_MASKS = [_step_mask(square, KING_STEPS) for square in range(64)]
+
+# pawns in this variant move one square up or down the file and capture on any of the four diagonals
+PAWN_PUSH_MASKS = [_step_mask(square, ((0, 1), (0, -1))) for square in range(64)]
+PAWN_CAPTURE_MASKS = [_step_mask(square, DIAGONAL_STEPS) for square in range(64)]
+
+# pawns on rank 2 may advance two squares up the board and pawns on rank 7 two squares down, whatever their color
+PAWN_DOUBLE_MASKS = [0] * 64
+for _file in range(8):
+    PAWN_DOUBLE_MASKS[8 + _file] = 1 << (24 + _file)
+    PAWN_DOUBLE_MASKS[48 + _file] = 1 << (32 + _file)
+
+# RAYS[direction][square] holds every square from square to the edge of the board in that direction
+RAYS = {step: [_ray_mask(square, step) for square in range(64)] for step in ORTHOGONAL_STEPS + DIAGONAL_STEPS}
+ROOK_MASKS = [sum(RAYS[step][square] for step in ORTHOGONAL_STEPS) for square in range(64)]
+BISHOP_MASKS = [sum(RAYS[step][square] for step in DIAGONAL_STEPS) for square in range(64)]
+
+# BETWEEN[start * 64 + end] holds the squares strictly between two squares on the same line, otherwise 0
+BETWEEN = [0] * 4096
+for _start in range(64):
+    for _step, _rays in RAYS.items():
+        for _end in range(64):
+            if _rays[_start] >> _end & 1:
+                BETWEEN[_start * 64 + _end] = _rays[_start] & ~_rays[_end] & ~(1 << _end)
+
+
+def sliding_attacks(square, letter, occupied):
+    """
+    Takes as a parameter a square index, the letter of a rook, bishop or queen, and the mask of occupied squares
+    Returns the mask of squares the piece reaches along its rays, up to and including the first piece on each ray
+    """
+    attacks = 0
+    for step in SLIDING_STEPS[letter]:
+        ray = RAYS[step][square]
+        blockers = ray & occupied
+        if blockers:
+            # the nearest blocker is the lowest bit on rays heading up the board and the highest bit otherwise
+            if step[1] > 0 or step[1] == 0 and step[0] > 0:
+                nearest = (blockers & -blockers).bit_length() - 1
+            else:
+                nearest = blockers.bit_length() - 1
+            ray &= ~RAYS[step][nearest]
+        attacks |= ray
+    return attacks
+
+
+class BitboardChessVar(ChessVar):
+    """
+    This class represents the same variant of chess as ChessVar, with move checks answered from bitboards.
+    The nested list board is still kept up to date so that code reading _board sees the same position.
+    """
+
+    __slots__ = ('_bitboards', '_occupied')
+
+    def __init__(self):
+        super().__init__()
+        self._build_bitboards()
+
+    def set_position(self, board, current_turn='white', game_state='UNFINISHED'):
+        """
+        Takes as a parameter a board laid out like _board, the player to move and the game state
+        Replaces the current position with it and rebuilds the bitboards
+        """
+        super().set_position(board, current_turn, game_state)
+        self._build_bitboards()
+
+    def clone(self):
+        """
+        Returns a new game in the same position, with its own copy of the bitboards
+        """
+        game = super().clone()
+        game._bitboards = self._bitboards.copy()
+        game._occupied = self._occupied.copy()
+        return game
+
+    def _build_bitboards(self):
+        """
+        Builds the bitboards from the nested list board
+        """
+        # one 64-bit integer per piece type and color, plus the squares occupied by each side
+        self._bitboards = dict.fromkeys(WHITE_PIECES + BLACK_PIECES, 0)
+        self._occupied = {'w': 0, 'b': 0}
+        for square in range(64):
+            piece = self._board[square & 7][square >> 3]
+            if piece != '':
+                self._bitboards[piece] |= 1 << square
+                self._occupied[piece[0]] |= 1 << square
+
+    def move_index(self, start, end, flags=0):
+        """
+        Takes as a parameter the start and end square indexes (a1 = 0 through h8 = 63) and optionally CHECK_ONLY to
+        check the move without making it
+        Makes the move and returns MOVE_OK, or returns the result code of the reason the move was rejected
+        """
+        if not 0 <= start < 64 or not 0 <= end < 64:
+            return MOVE_BAD_SQUARE
+
+        if self._game_state != 'UNFINISHED':
+            return MOVE_GAME_OVER
+
+        start_bit = 1 << start
+        end_bit = 1 << end
+        color = self._current_turn[0]
+        own = self._occupied[color]
+
+        # the start square must hold one of the current player's pieces and the end square must not, which also
+        #   rules out a start square that is the same as the end square
+        if not own & start_bit:
+            return MOVE_WRONG_TURN if (self._occupied['w'] | self._occupied['b']) & start_bit else MOVE_EMPTY_SQUARE
+        if own & end_bit:
+            return MOVE_OWN_PIECE_TARGET
+
+        start_piece = self._board[start & 7][start >> 3]
+        self._piece_type = PIECE_TYPES[start_piece[1]]
+        if not self._is_valid_square(start, end, self._piece_type):
+            return MOVE_ILLEGAL
+        if flags & CHECK_ONLY:
+            return MOVE_OK
+
+        end_piece = self._board[end & 7][end >> 3]
+        self._key ^= (ZOBRIST_KEYS[start_piece][start & 7][start >> 3]
+                      ^ ZOBRIST_KEYS[start_piece][end & 7][end >> 3] ^ ZOBRIST_BLACK_TO_MOVE)
+        if end_piece != '':
+            self._key ^= ZOBRIST_KEYS[end_piece][end & 7][end >> 3]
+            self.capture_piece(end_piece, end)
+        self._bitboards[start_piece] ^= start_bit | end_bit
+        self._occupied[color] = own ^ (start_bit | end_bit)
+        self._board[end & 7][end >> 3] = start_piece
+        self._board[start & 7][start >> 3] = ''
+
+        if end_piece != '':
+            self.check_state()
+        self._current_turn = 'black' if color == 'w' else 'white'
+        return MOVE_OK
+
+    def pop(self):
+        """
+        Takes back the last move made with push(), restoring the bitboards along with everything ChessVar restores
+        Returns the move that was taken back
+        """
+        move = super().pop()
+        start_square = SQUARE_INDEX[move[0]]
+        end_square = SQUARE_INDEX[move[1]]
+        start_piece = self._board[start_square & 7][start_square >> 3]
+        end_piece = self._board[end_square & 7][end_square >> 3]
+
+        self._bitboards[start_piece] ^= 1 << start_square | 1 << end_square
+        self._occupied[start_piece[0]] ^= 1 << start_square | 1 << end_square
+        if end_piece != '':
+            self._bitboards[end_piece] |= 1 << end_square
+            self._occupied[end_piece[0]] |= 1 << end_square
+        return move
+
+    def _piece_moves(self, x, y, piece):
+        """
+        Takes as a parameter the coordinates of a piece and the piece string
+        Yields the (start, end) moves the piece can make, read off its attack masks
+        """
+        square = y * 8 + x
+        own = self._occupied[piece[0]]
+        occupied = self._occupied['w'] | self._occupied['b']
+        letter = piece[1]
+
+        if letter == 'h':
+            targets = KNIGHT_MASKS[square] & ~own
+        elif letter == 'k':
+            targets = KING_MASKS[square] & ~own
+        elif letter == 'p':
+            targets = PAWN_PUSH_MASKS[square] & ~occupied | PAWN_CAPTURE_MASKS[square] & occupied & ~own
+            double = PAWN_DOUBLE_MASKS[square]
+            if double and not occupied & (BETWEEN[square * 64 + double.bit_length() - 1] | double):
+                targets |= double
+        else:
+            targets = sliding_attacks(square, letter, occupied) & ~own
+
+        start = SQUARE_NAMES[square]
+        while targets:
+            end_bit = targets & -targets
+            targets ^= end_bit
+            yield start, SQUARE_NAMES[end_bit.bit_length() - 1]
+
+    def is_valid(self, start, end, piece):
+        """
+        Takes as a parameter the starting coordinate and ending coordinate, and piece which holds its type
+        Checks if a move is valid using the precomputed masks
+        """
+        return self._is_valid_square(start[1] * 8 + start[0], end[1] * 8 + end[0], piece)
+
+    def _is_valid_square(self, start, end, piece):
+        """
+        Takes as a parameter the starting and ending square indexes and piece which holds its type
+        Checks if a move is valid, including traversing through other pieces which is invalid unless piece is a knight
+        """
+        end_bit = 1 << end
+        occupied = self._occupied['w'] | self._occupied['b']
+
+        if piece == 'knight':
+            return bool(KNIGHT_MASKS[start] & end_bit)
+        elif piece == 'king':
+            return bool(KING_MASKS[start] & end_bit)
+        elif piece == 'rook':
+            return bool(ROOK_MASKS[start] & end_bit) and not BETWEEN[start * 64 + end] & occupied
+        elif piece == 'bishop':
+            return bool(BISHOP_MASKS[start] & end_bit) and not BETWEEN[start * 64 + end] & occupied
+        elif piece == 'queen':
+            line = ROOK_MASKS[start] | BISHOP_MASKS[start]
+            return bool(line & end_bit) and not BETWEEN[start * 64 + end] & occupied
+        else:
+            if PAWN_PUSH_MASKS[start] & end_bit:        # pawns move forward onto an empty square
+                return not occupied & end_bit
+            elif PAWN_DOUBLE_MASKS[start] & end_bit:    # both the square passed over and the end must be empty
+                return not occupied & (BETWEEN[start * 64 + end] | end_bit)
+            elif PAWN_CAPTURE_MASKS[start] & end_bit:   # pawns only move diagonally to capture
+                return bool(occupied & end_bit)
+            return False
+
+    def capture_piece(self, end_piece, end_square=None):
+        """
+        Takes as a parameter end_piece which is a string of the end piece, and optionally the square it stands on
+        Clears the piece from its bitboard and decrements the count for that piece in the appropriate player's pile
+        """
+        if end_square is not None:
+            self._bitboards[end_piece] &= ~(1 << end_square)
+            self._occupied[end_piece[0]] &= ~(1 << end_square)
+        super().capture_piece(end_piece)
+
+    def check_state(self):
+        """
+        Checks to see if the bitboard of any piece type either player is counting is now empty
+        Sets _game_state according to appropriate winner
+        """
+        for piece in self._white_count:
+            if self._bitboards[piece] == 0:
+                self._game_state = 'BLACK_WON'
+
+        for piece in self._black_count:
+            if self._bitboards[piece] == 0:
+                self._game_state = 'WHITE_WON'
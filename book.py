@@ -0,0 +1,196 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Opening book for ChessVar built from a corpus of finished games. Every position reached in the first
+#               plies of the games is stored under its Zobrist key with the moves played from it and how those games
+#               ended. The book file keeps the keys in one sorted array that is searched in place through mmap.
+#               Run with "python book.py build games.jsonl openings.cvbk" to build a book from selfplay.py output or
+#               a game database, and "python book.py show openings.cvbk e2e4" to list the moves after a prefix.
+
+import argparse
+import bisect
+import json
+import mmap
+import struct
+
+from gamedb import GameDatabase, encode_move, decode_move
+from session import GameSession
+
+# positions further into a game than this aren't added to the book by default
+BOOK_PLIES = 12
+
+# best_move() doesn't trust a move played in fewer games than this by default
+MIN_GAMES = 10
+
+# file layout: a header, then every key in ascending order, then one entry per key
+#   header: magic, format version, the plies the book was built from, number of entries
+#   keys: one 8-byte position key per entry, a position with several moves has one entry per move
+#   entries: the move, then the games it was played in, won by white and won by black
+MAGIC = b'CVBK'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ')
+ENTRY = struct.Struct('<HxxIII')
+
+
+def read_corpus(path):
+    """
+    Takes as a parameter the path of a game database made by gamedb.py, or of JSON lines written by selfplay.py
+    Yields each game as a (moves, game state) tuple
+    """
+    if path.endswith('.cvdb'):
+        with GameDatabase(path) as database:
+            yield from database
+        return
+
+    with open(path) as games:
+        for line in games:
+            record = json.loads(line)
+            yield [(move[:2], move[2:]) for move in record['moves'].split()], record['result']
+
+
+def count_moves(games, plies=BOOK_PLIES):
+    """
+    Takes as a parameter an iterable of (moves, game state) games from the starting position and the number of plies
+    to count from each
+    Returns a dictionary of (position key, move code) -> [games, white wins, black wins]
+    """
+    counts = {}
+    for moves, game_state in games:
+        white_won = game_state == 'WHITE_WON'
+        black_won = game_state == 'BLACK_WON'
+        session = GameSession()
+        for start, end in moves[:plies]:
+            key = session.position_key()
+            if not session.make_move(start, end):      # a corrupt game, the rest of it can't be trusted
+                break
+            entry = counts.setdefault((key, encode_move((start, end))), [0, 0, 0])
+            entry[0] += 1
+            entry[1] += white_won
+            entry[2] += black_won
+    return counts
+
+
+def write_book(path, counts, plies=BOOK_PLIES, min_games=1):
+    """
+    Takes as a parameter the path to write, the counts from count_moves(), the plies they were counted from and the
+    fewest games a move must have been played in to be kept
+    Writes the book file and returns the number of entries in it
+    """
+    entries = sorted(item for item in counts.items() if item[1][0] >= min_games)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, plies, len(entries)))
+        file.write(struct.pack(f'<{len(entries)}Q', *(key for (key, _), _ in entries)))
+        for (_, move), (games, white_won, black_won) in entries:
+            file.write(ENTRY.pack(move, games, white_won, black_won))
+    return len(entries)
+
+
+class OpeningBook:
+    """
+    This class represents an opening book file read through mmap.
+    """
+
+    def __init__(self, path):
+        """
+        Takes as a parameter the path of a file made by write_book()
+        """
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.plies, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f'{path} is not a version {VERSION} opening book')
+
+        # the keys are searched as an array of 8-byte integers straight out of the file
+        self._keys = memoryview(self._map)[HEADER.size:HEADER.size + self._count * 8].cast('Q')
+        self._entries_offset = HEADER.size + self._count * 8
+
+    def __len__(self):
+        return self._count
+
+    def probe(self, game):
+        """
+        Takes as a parameter a ChessVar game or a GameSession
+        Returns a list of (move, games, wins, draws, losses) for every move the book has from the position, from the
+        point of view of the player to move and most played first, or an empty list if the position isn't in the book
+        """
+        if game.get_game_state() != 'UNFINISHED':
+            return []
+        key = game.position_key()
+        first = bisect.bisect_left(self._keys, key)
+        white_to_move = game.get_current_turn() == 'white'
+
+        candidates = []
+        for number in range(first, self._count):
+            if self._keys[number] != key:
+                break
+            move, games, white_won, black_won = ENTRY.unpack_from(self._map, self._entries_offset + number * ENTRY.size)
+            wins, losses = (white_won, black_won) if white_to_move else (black_won, white_won)
+            candidates.append((decode_move(move), games, wins, games - wins - losses, losses))
+        candidates.sort(key=lambda candidate: -candidate[1])
+        return candidates
+
+    def probe_moves(self, moves):
+        """
+        Takes as a parameter a list of (start, end) moves played from the starting position
+        Returns the book's moves after them, like probe(), or an empty list if one of the moves is illegal
+        """
+        session = GameSession()
+        for start, end in moves:
+            if not session.make_move(start, end):
+                return []
+        return self.probe(session)
+
+    def best_move(self, game, min_games=MIN_GAMES):
+        """
+        Takes as a parameter a ChessVar game or a GameSession and the fewest games a move must have been played in
+        Returns the legal book move with the best score for the player to move, counting a draw as half a win, or None
+        if the book has no such move
+        """
+        best = None
+        best_score = -1.0
+        for move, games, wins, draws, _ in self.probe(game):
+            score = (wins + draws / 2) / games
+            # two positions sharing a key is very unlikely, but a book move is still only played if it's legal here
+            if games >= min_games and score > best_score and game.move_error(*move) is None:
+                best = move
+                best_score = score
+        return best
+
+    def close(self):
+        self._keys.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and read ChessVar opening books.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='build a book from selfplay.py output or a game database')
+    build.add_argument('games', help='a .jsonl file from selfplay.py or a .cvdb file from gamedb.py')
+    build.add_argument('book')
+    build.add_argument('--plies', type=int, default=BOOK_PLIES, help='plies of each game to add to the book')
+    build.add_argument('--min-games', type=int, default=1, help='fewest games a move must be played in to be kept')
+    show = commands.add_parser('show', help='list the book moves after some moves from the starting position')
+    show.add_argument('book')
+    show.add_argument('moves', nargs='*', help='moves such as e2e4')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        counts = count_moves(read_corpus(args.games), args.plies)
+        entries = write_book(args.book, counts, args.plies, args.min_games)
+        print(f'{entries} book moves written to {args.book}')
+    else:
+        with OpeningBook(args.book) as book:
+            for (start, end), games, wins, draws, losses in book.probe_moves([(move[:2], move[2:])
+                                                                              for move in args.moves]):
+                print(f'{start}{end}: {games} games, {wins} won, {draws} drawn, {losses} lost')
+
+
+if __name__ == '__main__':
+    main()
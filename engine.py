@@ -0,0 +1,296 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Alpha-beta search engine for ChessVar. Uses iterative deepening, a transposition table, move ordering
+#               (captures, killer moves, history) and a capture-only quiescence search. The evaluation follows the
+#               variant's win condition, where losing the last piece of any one type loses the game.
+
+import time
+
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_SCORE = 1000000
+INFINITY = WIN_SCORE + 1
+
+# any score closer to WIN_SCORE than this is a forced win or loss found by the search
+WIN_THRESHOLD = WIN_SCORE - 1000
+
+# how much each piece is worth while its type is in no danger of running out
+PIECE_VALUES = {'p': 100, 'h': 300, 'b': 320, 'r': 500, 'q': 900, 'k': 400}
+
+# penalty for a piece type with only this many pieces left, since losing all of one type loses the game
+# a lone king and a lone queen are where every game starts, so only pieces that get down to one or two count
+SHORTAGE_PENALTY = {1: 600, 2: 150}
+
+# the engine checks the clock once every this many nodes
+CLOCK_INTERVAL = 1024
+
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget runs out
+    """
+
+
+class ChessVarEngine:
+    """
+    This class represents a search engine that picks moves for a ChessVar game.
+    """
+
+    def __init__(self, max_depth=4, time_limit=None, table_bytes=16 * 1024 * 1024, tablebase=None, book=None):
+        """
+        Takes as a parameter the deepest search to run, a time limit in seconds or None, the transposition table's
+        memory cap in bytes, optionally a tablebase.Tablebase whose results are used instead of searching, and
+        optionally a book.OpeningBook whose moves are played instead of searching
+        """
+        self._max_depth = max_depth
+        self._time_limit = time_limit
+        self._table = TranspositionTable(table_bytes)
+        self._tablebase = tablebase
+        self._book = book
+        self._killers = []
+        self._history = {}
+        self._deadline = None
+        self._root_move = None
+        self.nodes = 0
+
+    def best_move(self, game, max_depth=None, time_limit=None):
+        """
+        Takes as a parameter a ChessVar game, and optionally a depth and time budget for this search only
+        Returns the best (start, end) move for the player to move, or None if there is no move to make
+        """
+        return self.search(game, max_depth, time_limit)[0]
+
+    def search(self, game, max_depth=None, time_limit=None):
+        """
+        Takes as a parameter a ChessVar game, and optionally a depth and time budget for this search only
+        Searches one ply deeper at a time until the depth or time runs out and returns (move, score, depth) from the
+        deepest search that finished. The score is from the point of view of the player to move
+        A position in the opening book isn't searched, its book move is returned with the static evaluation and depth 0
+        The game is left exactly as it was passed in
+        """
+        max_depth = self._max_depth if max_depth is None else max_depth
+        time_limit = self._time_limit if time_limit is None else time_limit
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self._killers = [[None, None] for _ in range(max_depth + 1)]
+        self._history = {}
+        self.nodes = 0
+
+        if self._book is not None:
+            move = self._book.best_move(game)
+            if move is not None:
+                return move, self._evaluate(game), 0
+
+        moves = list(game.legal_moves())
+        if not moves:
+            return None, self._evaluate(game), 0
+
+        best = (moves[0], self._evaluate(game), 0)
+        history_length = len(game._history)
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(game, depth, 0, -INFINITY, INFINITY)
+            except _SearchTimeout:
+                # undo whatever moves the interrupted search still had pushed
+                while len(game._history) > history_length:
+                    game.pop()
+                break
+
+            best = (self._root_move, score, depth)
+            if abs(score) >= WIN_THRESHOLD:      # a forced result was found, searching deeper won't change it
+                break
+        return best
+
+    def _negamax(self, game, depth, ply, alpha, beta):
+        """
+        Takes as a parameter the game, the depth left to search, the distance from the root and the alpha-beta window
+        Returns the score of the position for the player to move
+        """
+        self._count_node()
+
+        if game._game_state != 'UNFINISHED':
+            # the previous move won the game, so the player to move has lost
+            return -WIN_SCORE + ply
+        if self._tablebase is not None and ply > 0:
+            plies = self._tablebase.probe(game)
+            if plies is not None:
+                # the position is solved, a win or loss comes that many plies after this one
+                if plies > 0:
+                    return WIN_SCORE - ply - plies
+                elif plies < 0:
+                    return -WIN_SCORE + ply - plies
+                return 0
+        if depth <= 0:
+            return self._quiescence(game, ply, alpha, beta)
+
+        key = game.position_key()
+        entry = self._table.probe(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, value, flag, table_move = entry
+            if entry_depth >= depth and ply > 0:
+                value = _from_table(value, ply)
+                if flag == EXACT:
+                    return value
+                elif flag == LOWER_BOUND and value >= beta:
+                    return value
+                elif flag == UPPER_BOUND and value <= alpha:
+                    return value
+
+        moves = self._order_moves(game, list(game.legal_moves()), ply, table_move)
+        if not moves:
+            return 0        # a player who can't move can't lose any pieces either
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = moves[0]
+        for move in moves:
+            capture = _piece_on(game, move[1]) != ''
+            game.push(move)
+            score = -self._negamax(game, depth - 1, ply + 1, -beta, -alpha)
+            game.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not capture:
+                    self._remember_cutoff(move, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, _to_table(best_score, ply), flag, best_move)
+        if ply == 0:
+            self._root_move = best_move
+        return best_score
+
+    def _quiescence(self, game, ply, alpha, beta):
+        """
+        Takes as a parameter the game, the distance from the root and the alpha-beta window
+        Searches captures only until the position is quiet so the evaluation isn't taken in the middle of an exchange
+        """
+        self._count_node()
+
+        if game._game_state != 'UNFINISHED':
+            return -WIN_SCORE + ply
+
+        stand_pat = self._evaluate(game)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = [move for move in game.legal_moves() if _piece_on(game, move[1]) != '']
+        for move in self._order_moves(game, captures, None, None):
+            game.push(move)
+            score = -self._quiescence(game, ply + 1, -beta, -alpha)
+            game.pop()
+
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _evaluate(self, game):
+        """
+        Takes as a parameter the game
+        Returns a score for the player to move, counting material and how close each player is to running out of a
+        piece type
+        """
+        if game._game_state == 'WHITE_WON':
+            score = WIN_SCORE
+        elif game._game_state == 'BLACK_WON':
+            score = -WIN_SCORE
+        else:
+            score = 0
+            for piece, count in game._white_count.items():
+                score += PIECE_VALUES[piece[1]] * count - SHORTAGE_PENALTY.get(count, 0)
+            for piece, count in game._black_count.items():
+                score -= PIECE_VALUES[piece[1]] * count - SHORTAGE_PENALTY.get(count, 0)
+        return score if game._current_turn == 'white' else -score
+
+    def _order_moves(self, game, moves, ply, table_move):
+        """
+        Takes as a parameter the game, a list of moves, the distance from the root (None in quiescence search) and the
+        best move stored for this position
+        Returns the moves sorted so the likeliest best moves are searched first: the stored move, captures of a
+        player's last piece of a type, other captures by most valuable victim and least valuable attacker, killer
+        moves and then the rest by history
+        """
+        opponent_count = game._black_count if game._current_turn == 'white' else game._white_count
+        killers = self._killers[ply] if ply is not None and ply < len(self._killers) else (None, None)
+
+        def move_order(move):
+            if move == table_move:
+                return 4000000
+            victim = _piece_on(game, move[1])
+            if victim != '':
+                attacker = _piece_on(game, move[0])
+                if opponent_count[victim] == 1:
+                    return 3000000
+                return 2000000 + PIECE_VALUES[victim[1]] * 10 - PIECE_VALUES[attacker[1]] // 10
+            if move == killers[0] or move == killers[1]:
+                return 1000000
+            return self._history.get(move, 0)
+
+        return sorted(moves, key=move_order, reverse=True)
+
+    def _remember_cutoff(self, move, depth, ply):
+        """
+        Takes as a parameter a quiet move that caused a beta cutoff, the depth left and the distance from the root
+        Records it as a killer move for this ply and raises its history score
+        """
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self._history[move] = self._history.get(move, 0) + depth * depth
+
+    def _count_node(self):
+        """
+        Counts a searched node and stops the search once the time budget runs out
+        """
+        self.nodes += 1
+        if self._deadline is not None and self.nodes % CLOCK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+
+
+def _piece_on(game, square):
+    """
+    Takes as a parameter the game and a square such as 'e2'
+    Returns the piece string on that square, or '' if it is empty
+    """
+    coord = game._value_dict[square]
+    return game._board[coord[0]][coord[1]]
+
+
+def _to_table(score, ply):
+    """
+    Takes as a parameter a score and the distance from the root
+    Returns the score to store, with wins counted from the stored position rather than from the root
+    """
+    if score >= WIN_THRESHOLD:
+        return score + ply
+    elif score <= -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    """
+    Takes as a parameter a stored score and the distance from the root
+    Returns the score with wins counted from the root again
+    """
+    if score >= WIN_THRESHOLD:
+        return score - ply
+    elif score <= -WIN_THRESHOLD:
+        return score + ply
+    return score
@@ -0,0 +1,229 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Compact binary formats for ChessVar. A position packs into 33 bytes (4 bits per square plus a byte for
+#               the side to move and game state), a move into 2 bytes, and games are kept in a database file that
+#               is read through mmap, so game N can be found without parsing or loading the rest of the file.
+#               Run with "python gamedb.py pack games.jsonl games.cvdb" to pack the output of selfplay.py.
+
+import argparse
+import json
+import mmap
+import struct
+
+from ChessVar import ChessVar, SQUARE_NAMES, SQUARE_INDEX, PIECE_CODES, CODE_PIECES, GAME_STATES
+
+POSITION_BYTES = 33
+
+# database layout: a header, then one record per game, then an index of where each record starts
+#   header: magic, format version, number of games, offset of the index
+#   record: game state code, number of plies, then 2 bytes per move
+#   index: one 8-byte offset per game
+MAGIC = b'CVDB'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxQQ')
+RECORD_HEADER = struct.Struct('<BxH')
+
+
+def encode_position(game):
+    """
+    Takes as a parameter a ChessVar game
+    Returns its position as 33 bytes: two squares per byte from a1 to h8, low 4 bits first, then a byte holding the
+    side to move in bit 0 and the game state in bits 1 and 2
+    """
+    data = bytearray(POSITION_BYTES)
+    for square in range(0, 64, 2):
+        low = PIECE_CODES[game._board[square & 7][square >> 3]]
+        high = PIECE_CODES[game._board[(square + 1) & 7][(square + 1) >> 3]]
+        data[square >> 1] = low | high << 4
+    data[32] = (game._current_turn == 'black') | GAME_STATES.index(game._game_state) << 1
+    return bytes(data)
+
+
+def decode_position(data, game_class=ChessVar):
+    """
+    Takes as a parameter 33 bytes made by encode_position and the ChessVar class to build
+    Returns a new game set up in that position
+    """
+    board = [[''] * 8 for _ in range(8)]
+    for square in range(64):
+        board[square & 7][square >> 3] = CODE_PIECES[data[square >> 1] >> (square & 1) * 4 & 15]
+
+    game = game_class()
+    game.set_position(board, 'black' if data[32] & 1 else 'white', GAME_STATES[data[32] >> 1 & 3])
+    return game
+
+
+def encode_move(move):
+    """
+    Takes as a parameter a (start, end) tuple of squares
+    Returns the move as an integer, the start square index in the upper 6 of 12 bits and the end in the lower 6
+    """
+    return SQUARE_INDEX[move[0]] << 6 | SQUARE_INDEX[move[1]]
+
+
+def decode_move(code):
+    """
+    Takes as a parameter an integer made by encode_move
+    Returns the (start, end) tuple of squares
+    """
+    return SQUARE_NAMES[code >> 6 & 63], SQUARE_NAMES[code & 63]
+
+
+def encode_moves(moves):
+    """
+    Takes as a parameter a list of (start, end) moves
+    Returns the moves packed 2 bytes each
+    """
+    return struct.pack(f'<{len(moves)}H', *(encode_move(move) for move in moves))
+
+
+def decode_moves(data):
+    """
+    Takes as a parameter bytes made by encode_moves
+    Returns the list of (start, end) moves
+    """
+    return [decode_move(code) for code in struct.unpack(f'<{len(data) // 2}H', data)]
+
+
+class GameDatabaseWriter:
+    """
+    This class represents a game database file being written.
+    """
+
+    def __init__(self, path):
+        """
+        Takes as a parameter the path of the file to create
+        """
+        self._file = open(path, 'wb')
+        self._offsets = []
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+
+    def add_game(self, moves, game_state):
+        """
+        Takes as a parameter a list of (start, end) moves from the starting position and the final game state
+        Appends the game to the file
+        """
+        self._offsets.append(self._file.tell())
+        self._file.write(RECORD_HEADER.pack(GAME_STATES.index(game_state), len(moves)))
+        self._file.write(encode_moves(moves))
+
+    def close(self):
+        """
+        Writes the index and the header and closes the file
+        """
+        index_offset = self._file.tell()
+        self._file.write(struct.pack(f'<{len(self._offsets)}Q', *self._offsets))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(self._offsets), index_offset))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class GameDatabase:
+    """
+    This class represents a game database file read through mmap. Games are only decoded when asked for.
+    """
+
+    def __init__(self, path):
+        """
+        Takes as a parameter the path of a file made by GameDatabaseWriter
+        """
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f'{path} is not a version {VERSION} game database')
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, number):
+        """
+        Takes as a parameter the number of a game
+        Returns a (moves, game state) tuple for that game
+        """
+        return self.moves(number), self.game_state(number)
+
+    def __iter__(self):
+        for number in range(self._count):
+            yield self[number]
+
+    def _record(self, number):
+        """
+        Takes as a parameter the number of a game
+        Returns the offset of the game's record, read from the index
+        """
+        if not 0 <= number < self._count:
+            raise IndexError('game number out of range')
+        return struct.unpack_from('<Q', self._map, self._index_offset + number * 8)[0]
+
+    def game_state(self, number):
+        """
+        Takes as a parameter the number of a game
+        Returns the game state the game finished in
+        """
+        return GAME_STATES[self._map[self._record(number)]]
+
+    def moves(self, number):
+        """
+        Takes as a parameter the number of a game
+        Returns the game's list of (start, end) moves
+        """
+        offset = self._record(number)
+        plies = RECORD_HEADER.unpack_from(self._map, offset)[1]
+        start = offset + RECORD_HEADER.size
+        return decode_moves(self._map[start:start + plies * 2])
+
+    def replay(self, number, plies=None, game_class=ChessVar):
+        """
+        Takes as a parameter the number of a game, how many of its moves to play (all of them if None) and the
+        ChessVar class to play them with
+        Returns a new game with the moves played
+        """
+        game = game_class()
+        for move in self.moves(number)[:plies]:
+            game.make_move(*move)
+        return game
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack and read ChessVar game databases.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    pack = commands.add_parser('pack', help='pack JSON lines written by selfplay.py into a database')
+    pack.add_argument('games')
+    pack.add_argument('database')
+    show = commands.add_parser('show', help='print one game from a database')
+    show.add_argument('database')
+    show.add_argument('number', type=int)
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        with open(args.games) as games, GameDatabaseWriter(args.database) as writer:
+            for line in games:
+                record = json.loads(line)
+                moves = [(move[:2], move[2:]) for move in record['moves'].split()]
+                writer.add_game(moves, record['result'])
+    else:
+        with GameDatabase(args.database) as database:
+            moves, game_state = database[args.number]
+            print(game_state, ' '.join(start + end for start, end in moves))
+
+
+if __name__ == '__main__':
+    main()
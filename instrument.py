@@ -0,0 +1,230 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Optional instrumentation of ChessVar's move checks. enable() swaps counting versions of make_move and
+#               the move validation method into the game classes and disable() puts the originals back, so games
+#               pay nothing for instrumentation while it is off. stats() returns a snapshot of the counters, and
+#               to_prometheus() and to_json() export one.
+
+import json
+import time
+
+from ChessVar import (ChessVar, BAD_SQUARE, GAME_OVER, EMPTY_SQUARE, WRONG_TURN, OWN_PIECE_TARGET, ILLEGAL_MOVE)
+from bitboard import BitboardChessVar, BETWEEN, PIECE_TYPES
+
+REASONS = (BAD_SQUARE, GAME_OVER, EMPTY_SQUARE, WRONG_TURN, OWN_PIECE_TARGET, ILLEGAL_MOVE)
+
+# pieces whose moves are checked along a line of squares
+RAY_PIECES = ('pawn', 'rook', 'bishop', 'queen')
+
+
+class _Counters:
+    """
+    This class represents the instrumentation counters, shared by every instrumented game in the process.
+    """
+
+    __slots__ = ('calls', 'accepted', 'rejected', 'validations', 'validation_seconds', 'ray_squares', 'in_move',
+                 'explaining')
+
+    def __init__(self):
+        self.calls = 0
+        self.accepted = 0
+        self.rejected = dict.fromkeys(REASONS, 0)
+        self.validations = dict.fromkeys(PIECE_TYPES.values(), 0)
+        self.validation_seconds = dict.fromkeys(PIECE_TYPES.values(), 0.0)
+        self.ray_squares = dict.fromkeys(PIECE_TYPES.values(), 0)
+        self.in_move = False        # inside an instrumented make_move, so one a subclass calls isn't counted twice
+        self.explaining = False     # finding why a move was rejected, which isn't counted as validation time
+
+
+_counters = _Counters()
+
+# (class, attribute name) -> the attribute the class itself had before enable(), or None if it inherited it
+_patched = {}
+
+
+def _ray_squares(game, start, end):
+    """
+    Takes as a parameter a game and the start and end square indexes of a move
+    Returns the number of squares between them that a check walking from start toward end looks at, stopping at the
+    first piece, or 0 if the squares aren't on one line
+    """
+    if not BETWEEN[start * 64 + end]:
+        return 0
+    file_step = ((end & 7) > (start & 7)) - ((end & 7) < (start & 7))
+    rank_step = ((end >> 3) > (start >> 3)) - ((end >> 3) < (start >> 3))
+    square = start + rank_step * 8 + file_step
+    scanned = 0
+    while square != end:
+        scanned += 1
+        if game._board[square & 7][square >> 3] != '':
+            break
+        square += rank_step * 8 + file_step
+    return scanned
+
+
+def _counting_make_move(make_move):
+    """
+    Takes as a parameter a make_move method
+    Returns a version that counts its calls, and its rejections by the reason move_error gives
+    """
+    def counted_make_move(self, start, end):
+        counters = _counters
+        if counters.in_move:
+            return make_move(self, start, end)
+
+        counters.in_move = True
+        try:
+            valid = make_move(self, start, end)
+        finally:
+            counters.in_move = False
+        counters.calls += 1
+        if valid:
+            counters.accepted += 1
+        else:
+            # a rejected move leaves the game as it was, so move_error sees the same position make_move did
+            counters.explaining = True
+            try:
+                counters.rejected[self.move_error(start, end)] += 1
+            finally:
+                counters.explaining = False
+        return valid
+
+    counted_make_move.instrumented = True
+    return counted_make_move
+
+
+def _timing_validation(validate, square_indexes):
+    """
+    Takes as a parameter a move validation method and whether it takes square indexes rather than [x, y] coordinates
+    Returns a version that times each call by piece type and counts the squares it scans along rays
+    """
+    def timed_validation(self, start, end, piece):
+        counters = _counters
+        if counters.explaining:
+            return validate(self, start, end, piece)
+
+        begin = time.perf_counter()
+        valid = validate(self, start, end, piece)
+        counters.validation_seconds[piece] += time.perf_counter() - begin
+        counters.validations[piece] += 1
+        if piece in RAY_PIECES:
+            if square_indexes:
+                counters.ray_squares[piece] += _ray_squares(self, start, end)
+            else:
+                counters.ray_squares[piece] += _ray_squares(self, start[1] * 8 + start[0], end[1] * 8 + end[0])
+        return valid
+
+    timed_validation.instrumented = True
+    return timed_validation
+
+
+def _patch(game_class, name, method):
+    """
+    Takes as a parameter a class, an attribute name and the method to put there
+    Replaces the attribute, remembering what to put back, unless it has already been replaced
+    """
+    if (game_class, name) in _patched or getattr(getattr(game_class, name), 'instrumented', False):
+        return
+    _patched[(game_class, name)] = game_class.__dict__.get(name)
+    setattr(game_class, name, method)
+
+
+def enable(*game_classes):
+    """
+    Takes as a parameter the game classes to instrument, ChessVar and BitboardChessVar if none are given
+    Starts counting moves made with those classes and any class that inherits from them
+    """
+    for game_class in game_classes or (ChessVar, BitboardChessVar):
+        _patch(game_class, 'make_move', _counting_make_move(game_class.make_move))
+        if hasattr(game_class, '_is_valid_square'):
+            _patch(game_class, '_is_valid_square', _timing_validation(game_class._is_valid_square, True))
+        else:
+            _patch(game_class, 'is_valid', _timing_validation(game_class.is_valid, False))
+
+
+def disable():
+    """
+    Puts back every method enable() replaced, so games run exactly as they do without instrumentation
+    """
+    for (game_class, name), original in reversed(list(_patched.items())):
+        if original is None:
+            delattr(game_class, name)
+        else:
+            setattr(game_class, name, original)
+    _patched.clear()
+
+
+def enabled():
+    """
+    Returns True if any class is instrumented
+    """
+    return bool(_patched)
+
+
+def reset():
+    """
+    Sets every counter back to zero
+    """
+    global _counters
+    in_move = _counters.in_move
+    _counters = _Counters()
+    _counters.in_move = in_move
+
+
+def stats():
+    """
+    Returns a snapshot of the counters as a dictionary: make_move calls, accepted moves and rejections by reason, and
+    for each piece type the number of validations, the seconds spent in them and the squares scanned along rays
+    """
+    counters = _counters
+    return {
+        'enabled': enabled(),
+        'make_move': {
+            'calls': counters.calls,
+            'accepted': counters.accepted,
+            'rejected': dict(counters.rejected),
+        },
+        'is_valid': {piece: {'calls': counters.validations[piece],
+                             'seconds': counters.validation_seconds[piece],
+                             'ray_squares': counters.ray_squares[piece]}
+                     for piece in counters.validations},
+    }
+
+
+def to_json(snapshot=None):
+    """
+    Takes as a parameter a snapshot from stats(), or None to take one now
+    Returns the snapshot as a JSON string
+    """
+    return json.dumps(stats() if snapshot is None else snapshot)
+
+
+def to_prometheus(snapshot=None):
+    """
+    Takes as a parameter a snapshot from stats(), or None to take one now
+    Returns the snapshot in the Prometheus text exposition format
+    """
+    snapshot = stats() if snapshot is None else snapshot
+    moves = snapshot['make_move']
+    validations = snapshot['is_valid']
+    lines = [
+        '# HELP chessvar_make_move_calls_total Calls to make_move.',
+        '# TYPE chessvar_make_move_calls_total counter',
+        f'chessvar_make_move_calls_total {moves["calls"]}',
+        '# HELP chessvar_make_move_accepted_total Moves make_move accepted.',
+        '# TYPE chessvar_make_move_accepted_total counter',
+        f'chessvar_make_move_accepted_total {moves["accepted"]}',
+        '# HELP chessvar_make_move_rejected_total Moves make_move rejected, by reason.',
+        '# TYPE chessvar_make_move_rejected_total counter',
+    ]
+    lines += [f'chessvar_make_move_rejected_total{{reason="{reason}"}} {count}'
+              for reason, count in moves['rejected'].items()]
+    for name, field, kind, description in (
+            ('chessvar_is_valid_calls_total', 'calls', 'counter', 'Move validations, by piece type.'),
+            ('chessvar_is_valid_seconds_total', 'seconds', 'counter', 'Seconds spent validating moves, by piece type.'),
+            ('chessvar_ray_squares_scanned_total', 'ray_squares', 'counter',
+             'Squares scanned along rays while validating moves, by piece type.')):
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} {kind}']
+        lines += [f'{name}{{piece="{piece}"}} {values[field]}' for piece, values in validations.items()]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,136 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Load generator for server.py. Opens many connections at once, each playing random legal moves in its
+#               own game, and reports moves per second and the p50/p99 latency of move requests.
+#               Run with "python loadtest.py --spawn --connections 10000" to start a local server and test it.
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+from server import raise_open_file_limit
+
+# connections opened at the same time while ramping up, so the server's listen backlog doesn't overflow
+CONNECT_BATCH = 500
+
+
+class _Client:
+    """
+    This class represents one load-test connection.
+    """
+
+    def __init__(self, reader, writer, rng):
+        self._reader = reader
+        self._writer = writer
+        self._rng = rng
+
+    async def request(self, **request):
+        """
+        Takes as a parameter the fields of a request
+        Sends the request and returns the response dictionary
+        """
+        self._writer.write(json.dumps(request).encode() + b'\n')
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def play(self, deadline, latencies):
+        """
+        Takes as a parameter the time to stop at and a list to add move latencies to
+        Plays random legal moves until the deadline, starting a new game whenever one ends
+        """
+        game = (await self.request(op='create'))['game']
+        while time.perf_counter() < deadline:
+            moves = (await self.request(op='legal', game=game))['moves']
+            if not moves:
+                await self.request(op='close', game=game)
+                game = (await self.request(op='create'))['game']
+                continue
+
+            move = self._rng.choice(moves)
+            begin = time.perf_counter()
+            await self.request(op='move', game=game, start=move[:2], end=move[2:])
+            latencies.append(time.perf_counter() - begin)
+        await self.request(op='close', game=game)
+
+    def close(self):
+        self._writer.close()
+
+
+async def run(host, port, unix_path, connections, duration, seed=0):
+    """
+    Takes as a parameter where the server listens, the number of connections, how many seconds to play for and a
+    random seed
+    Returns the list of move latencies in seconds and the number of seconds spent playing
+    """
+    clients = []
+    for first in range(0, connections, CONNECT_BATCH):
+        batch = range(first, min(first + CONNECT_BATCH, connections))
+        if unix_path is not None:
+            opened = [asyncio.open_unix_connection(unix_path) for _ in batch]
+        else:
+            opened = [asyncio.open_connection(host, port) for _ in batch]
+        for reader, writer in await asyncio.gather(*opened):
+            clients.append(_Client(reader, writer, random.Random(seed * 2 ** 32 + len(clients))))
+
+    latencies = []
+    begin = time.perf_counter()
+    await asyncio.gather(*(client.play(begin + duration, latencies) for client in clients))
+    elapsed = time.perf_counter() - begin
+    for client in clients:
+        client.close()
+    return latencies, elapsed
+
+
+def _percentile(values, fraction):
+    """
+    Takes as a parameter a sorted list and a fraction between 0 and 1
+    Returns the value at that fraction of the list
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a ChessVar server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='path of the server\'s Unix socket instead of TCP')
+    parser.add_argument('--connections', type=int, default=10000)
+    parser.add_argument('--duration', type=float, default=10, help='seconds to play for')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--spawn', action='store_true', help='start a server for the test and stop it afterwards')
+    parser.add_argument('--workers', type=int, default=0, help='worker processes for a spawned server')
+    args = parser.parse_args()
+
+    raise_open_file_limit()
+    server = None
+    if args.spawn:
+        command = [sys.executable, 'server.py', '--workers', str(args.workers)]
+        command += ['--unix', args.unix] if args.unix else ['--host', args.host, '--port', str(args.port)]
+        server = subprocess.Popen(command, cwd=sys.path[0] or '.')
+        time.sleep(1)       # give the server time to start listening
+
+    try:
+        latencies, elapsed = asyncio.run(run(args.host, args.port, args.unix, args.connections, args.duration,
+                                             args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    if not latencies:
+        print('no moves were made')
+        return
+    print(f'{args.connections} connections, {len(latencies)} moves in {elapsed:.1f}s, '
+          f'{len(latencies) / elapsed:,.0f} moves/s')
+    print(f'move latency p50 {_percentile(latencies, 0.5) * 1000:.2f} ms, '
+          f'p99 {_percentile(latencies, 0.99) * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Monte Carlo tree search player for ChessVar. The tree is searched with UCT and each new leaf is scored by
+#               a random playout run by a small kernel working on a bytearray of piece codes with precomputed target
+#               tables, so a playout does no string handling or dictionary lookups. With more than one worker, each
+#               process searches its own tree from the root and the visit counts are added up (root parallelism).
+#               Run with "python mcts.py --playouts 5000 --workers 4" to pick a move from the starting position.
+
+import argparse
+import concurrent.futures
+import math
+import random
+import time
+
+from ChessVar import SQUARE_NAMES, SQUARE_INDEX, SLIDING_STEPS
+from bitboard import KNIGHT_MASKS, KING_MASKS, PAWN_CAPTURE_MASKS
+from session import GameSession, CODE_COLORS, CODE_LETTERS, WHITE
+
+# random playouts that go on this long without a winner count as a draw
+MAX_PLIES = 200
+
+
+def _mask_squares(mask):
+    """
+    Takes as a parameter a mask of squares
+    Returns a tuple of their square indexes, lowest first
+    """
+    return tuple(square for square in range(64) if mask >> square & 1)
+
+
+def _rays(square, letter):
+    """
+    Takes as a parameter a square index and the letter of a rook, bishop or queen
+    Returns a tuple with one tuple per direction of the squares along it, nearest first
+    """
+    rays = []
+    for step_x, step_y in SLIDING_STEPS[letter]:
+        ray = []
+        x = (square & 7) + step_x
+        y = (square >> 3) + step_y
+        while 0 <= x < 8 and 0 <= y < 8:
+            ray.append(y * 8 + x)
+            x += step_x
+            y += step_y
+        if ray:
+            rays.append(tuple(ray))
+    return tuple(rays)
+
+
+# move tables indexed by piece code and then square, None for the pieces that don't move that way
+#   LEAPS: the squares a knight or king can move to
+#   RAYS: the directions a rook, bishop or queen can slide along
+LEAPS = [None] * 13
+RAYS = [None] * 13
+for _code in range(1, 13):
+    if CODE_LETTERS[_code] == 'h':
+        LEAPS[_code] = [_mask_squares(KNIGHT_MASKS[square]) for square in range(64)]
+    elif CODE_LETTERS[_code] == 'k':
+        LEAPS[_code] = [_mask_squares(KING_MASKS[square]) for square in range(64)]
+    elif CODE_LETTERS[_code] in SLIDING_STEPS:
+        RAYS[_code] = [_rays(square, CODE_LETTERS[_code]) for square in range(64)]
+del _code
+
+# pawns move one square up or down the file, two from rank 2 up or rank 7 down, and capture on the diagonals
+PAWN_PUSHES = [tuple(end for end in (square + 8, square - 8) if 0 <= end < 64) for square in range(64)]
+PAWN_DOUBLES = [(square + 8, square + 16) if square >> 3 == 1 else (square - 8, square - 16) if square >> 3 == 6
+                else None for square in range(64)]
+PAWN_CAPTURES = [_mask_squares(PAWN_CAPTURE_MASKS[square]) for square in range(64)]
+
+
+def kernel_moves(board, turn):
+    """
+    Takes as a parameter a bytearray of piece codes by square and the player to move (0 white, 1 black)
+    Returns a list of every legal move as an integer, the start square index times 64 plus the end square index
+    """
+    moves = []
+    append = moves.append
+    colors = CODE_COLORS
+    for start, code in enumerate(board):
+        if not code or colors[code] != turn:
+            continue
+        origin = start << 6
+        rays = RAYS[code]
+        if rays is not None:
+            for ray in rays[start]:
+                for end in ray:
+                    target = board[end]
+                    if target:
+                        if colors[target] != turn:
+                            append(origin | end)
+                        break
+                    append(origin | end)
+            continue
+
+        leaps = LEAPS[code]
+        if leaps is not None:
+            for end in leaps[start]:
+                target = board[end]
+                if not target or colors[target] != turn:
+                    append(origin | end)
+            continue
+
+        for end in PAWN_PUSHES[start]:
+            if not board[end]:
+                append(origin | end)
+        double = PAWN_DOUBLES[start]
+        if double is not None and not board[double[0]] and not board[double[1]]:
+            append(origin | double[1])
+        for end in PAWN_CAPTURES[start]:
+            target = board[end]
+            if target and colors[target] != turn:
+                append(origin | end)
+    return moves
+
+
+def kernel_move(board, counts, turn, move):
+    """
+    Takes as a parameter a bytearray of piece codes by square, a bytearray of piece counts by code, the player to move
+    and a legal move from kernel_moves()
+    Makes the move and returns the player it wins the game for, or None if the game goes on
+    """
+    start = move >> 6
+    end = move & 63
+    target = board[end]
+    board[end] = board[start]
+    board[start] = 0
+    if target:
+        counts[target] -= 1
+        if not counts[target]:      # the last piece of its type was captured, its owner loses
+            return turn
+    return None
+
+
+def random_playout(board, counts, turn, rng, max_plies=MAX_PLIES):
+    """
+    Takes as a parameter a bytearray of piece codes by square, a bytearray of piece counts by code, the player to move,
+    a random.Random and the most plies to play
+    Plays random legal moves on the bytearrays until the game is won and returns the winner (0 white, 1 black), or
+    None if the plies ran out or a player had no move
+    """
+    random_index = rng.random
+    for _ in range(max_plies):
+        moves = kernel_moves(board, turn)
+        if not moves:
+            return None
+        move = moves[int(random_index() * len(moves))]
+        start = move >> 6
+        end = move & 63
+        target = board[end]
+        board[end] = board[start]
+        board[start] = 0
+        if target:
+            counts[target] -= 1
+            if not counts[target]:
+                return turn
+        turn ^= 1
+    return None
+
+
+class _Node:
+    """
+    This class represents a position in the search tree, reached by move from its parent.
+    """
+
+    __slots__ = ('move', 'parent', 'player', 'winner', 'children', 'untried', 'visits', 'score')
+
+    def __init__(self, move, parent, player, winner=None):
+        self.move = move
+        self.parent = parent
+        self.player = player        # the player who made the move into this position
+        self.winner = winner        # set when the move won the game
+        self.children = []
+        self.untried = None         # moves not yet expanded, filled in the first time the node is reached
+        self.visits = 0
+        self.score = 0.0            # wins for player, with draws counting a half
+
+    def select_child(self, exploration):
+        """
+        Takes as a parameter the UCT exploration constant
+        Returns the child with the highest upper confidence bound
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.score / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+def search_tree(board, counts, turn, playouts, exploration, max_plies, seed):
+    """
+    Takes as a parameter the root position as bytes of piece codes and piece counts and the player to move, the number
+    of playouts, the UCT exploration constant, the most plies per playout and a random seed
+    Searches one tree and returns a dictionary of each root move's (visits, score)
+    """
+    rng = random.Random(seed)
+    root = _Node(None, None, turn ^ 1)
+    for _ in range(playouts):
+        node = root
+        position = bytearray(board)
+        piece_counts = bytearray(counts)
+        to_move = turn
+
+        # walk down the tree by UCT until reaching a move not tried yet, then play the rest of the game at random
+        while True:
+            if node.winner is not None:
+                winner = node.winner
+                break
+            if node.untried is None:
+                node.untried = kernel_moves(position, to_move)
+                rng.shuffle(node.untried)
+            if node.untried:
+                move = node.untried.pop()
+                winner = kernel_move(position, piece_counts, to_move, move)
+                child = _Node(move, node, to_move, winner)
+                node.children.append(child)
+                node = child
+                if winner is None:
+                    winner = random_playout(position, piece_counts, to_move ^ 1, rng, max_plies)
+                break
+            if not node.children:       # the player to move has no legal moves
+                winner = None
+                break
+            node = node.select_child(exploration)
+            kernel_move(position, piece_counts, to_move, node.move)
+            to_move ^= 1
+
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.score += 0.5
+            elif winner == node.player:
+                node.score += 1
+            node = node.parent
+    return {child.move: (child.visits, child.score) for child in root.children}
+
+
+def _search_tree_args(args):
+    """
+    Takes as a parameter a tuple of search_tree arguments, since executor.map passes one argument per call
+    """
+    return search_tree(*args)
+
+
+class MCTSPlayer:
+    """
+    This class represents a Monte Carlo tree search player that picks moves for a ChessVar game.
+    """
+
+    def __init__(self, playouts=2000, exploration=1.4, max_plies=MAX_PLIES, workers=1, seed=0):
+        """
+        Takes as a parameter the playouts per move, the UCT exploration constant, the most plies per playout, the
+        number of worker processes to split the playouts across and a random seed
+        """
+        self._playouts = playouts
+        self._exploration = exploration
+        self._max_plies = max_plies
+        self._workers = workers
+        self._seed = seed
+        self._searches = 0
+        self._executor = None
+        self.playouts = 0
+        self.playouts_per_second = 0.0
+
+    def best_move(self, game):
+        """
+        Takes as a parameter a ChessVar game or a GameSession
+        Returns the most visited (start, end) move for the player to move, or None if there is no move to make
+        """
+        return self.search(game)[0]
+
+    def search(self, game):
+        """
+        Takes as a parameter a ChessVar game or a GameSession
+        Returns (move, score): the most visited move and the share of its playouts the player to move won, with draws
+        counting a half. The game isn't changed
+        """
+        session = game if isinstance(game, GameSession) else GameSession.from_game(game)
+        if session.get_game_state() != 'UNFINISHED':
+            return None, 0.0
+
+        # every search gets its own seeds, so a player doesn't repeat itself from one move to the next
+        seed = (self._seed * 2 ** 20 + self._searches) * 64
+        self._searches += 1
+        board = bytes(session._board)
+        counts = bytes(session._counts)
+        begin = time.perf_counter()
+        if self._workers > 1:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(self._workers)
+            shares = [self._playouts // self._workers + (worker < self._playouts % self._workers)
+                      for worker in range(self._workers)]
+            jobs = [(board, counts, session._turn, share, self._exploration, self._max_plies, seed + worker)
+                    for worker, share in enumerate(shares)]
+            trees = list(self._executor.map(_search_tree_args, jobs))
+        else:
+            trees = [search_tree(board, counts, session._turn, self._playouts, self._exploration, self._max_plies,
+                                 seed)]
+        elapsed = time.perf_counter() - begin
+
+        totals = {}
+        for tree in trees:
+            for move, (visits, score) in tree.items():
+                total = totals.get(move, (0, 0.0))
+                totals[move] = (total[0] + visits, total[1] + score)
+        self.playouts = sum(visits for visits, _ in totals.values())
+        self.playouts_per_second = self.playouts / elapsed if elapsed > 0 else 0.0
+        if not totals:
+            return None, 0.0
+
+        move, (visits, score) = max(totals.items(), key=lambda item: item[1][0])
+        return (SQUARE_NAMES[move >> 6], SQUARE_NAMES[move & 63]), score / visits
+
+    def close(self):
+        """
+        Shuts down the worker processes, if any were started
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pick a ChessVar move with Monte Carlo tree search.')
+    parser.add_argument('--playouts', type=int, default=5000)
+    parser.add_argument('--exploration', type=float, default=1.4, help='UCT exploration constant')
+    parser.add_argument('--max-plies', type=int, default=MAX_PLIES, help='longest random playout')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes, each searching its own tree')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--moves', default='', help='moves to play first, such as "e2e4 e7e5"')
+    args = parser.parse_args()
+
+    session = GameSession()
+    for move in args.moves.split():
+        if move[:2] not in SQUARE_INDEX or move[2:] not in SQUARE_INDEX or not session.make_move(move[:2], move[2:]):
+            parser.error(f'illegal move {move}')
+
+    with MCTSPlayer(args.playouts, args.exploration, args.max_plies, args.workers, args.seed) as player:
+        move, score = player.search(session)
+    if move is None:
+        print('no move to make')
+        return
+    player_name = 'white' if session._turn == WHITE else 'black'
+    print(f'{player_name} plays {move[0]}{move[1]}, scoring {score:.3f} over {player.playouts} playouts '
+          f'({player.playouts_per_second:,.0f} playouts/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Opt-in cache of move checks and legal move lists for ChessVar. Answers are stored under the position's
+#               Zobrist key, so once make_move changes the position a game simply looks up different entries and
+#               nothing has to be cleared. The cache holds a fixed number of entries and evicts the least recently
+#               used one when full. Give each game its own MoveCache or share shared_cache() across the process.
+
+import collections
+
+from ChessVar import SQUARE_INDEX, MOVE_OK, MOVE_BAD_SQUARE, CHECK_ONLY
+
+# entries a cache holds when no size is given
+DEFAULT_ENTRIES = 65536
+
+
+
+class MoveCache:
+    """
+    This class represents a size-bounded least recently used cache of move check results and legal move lists.
+    It works with any game that has position_key(), get_game_state(), move_index() and legal_moves(): every ChessVar
+    backend and GameSession.
+    """
+
+    __slots__ = ('_entries', '_max_entries', 'hits', 'misses', 'evictions')
+
+    def __init__(self, max_entries=DEFAULT_ENTRIES):
+        """
+        Takes as a parameter the most entries to hold, where a move check and a position's legal moves are one each
+        """
+        if max_entries < 1:
+            raise ValueError('a move cache needs room for at least one entry')
+        self._entries = collections.OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, value):
+        """
+        Takes as a parameter an entry key and its value
+        Caches the value, evicting the least recently used entry if the cache is full
+        """
+        self._entries[key] = value
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def move_result(self, game, start, end):
+        """
+        Takes as a parameter a game and the intended piece to move and destination
+        Returns the result code move_index would give for the move, MOVE_OK if it is legal. The game isn't changed
+        """
+        # entries are keyed by (position key, game state, start, end), the game state because set_position can put
+        #   the same board in a different state
+        key = (game.position_key(), game.get_game_state(), start, end)
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            start_square = SQUARE_INDEX.get(start)
+            end_square = SQUARE_INDEX.get(end)
+            if start_square is None or end_square is None:
+                result = MOVE_BAD_SQUARE
+            else:
+                result = game.move_index(start_square, end_square, CHECK_ONLY)
+            self._store(key, result)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return result
+
+    def is_valid(self, game, start, end):
+        """
+        Takes as a parameter a game and the intended piece to move and destination
+        Returns True if make_move would accept the move. The game isn't changed
+        """
+        return self.move_result(game, start, end) == MOVE_OK
+
+    def legal_moves(self, game):
+        """
+        Takes as a parameter a game
+        Returns a tuple of every legal (start, end) move for the player to move, empty once the game has been won
+        """
+        key = (game.position_key(), game.get_game_state())
+        moves = self._entries.get(key)
+        if moves is None:
+            self.misses += 1
+            moves = tuple(game.legal_moves())
+            self._store(key, moves)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return moves
+
+    def stats(self):
+        """
+        Returns a dictionary of the cache's size, capacity, hits, misses and evictions
+        """
+        return {'entries': len(self._entries), 'max_entries': self._max_entries, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+    def clear(self):
+        """
+        Removes every entry and sets the counters back to zero
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+_shared = None
+
+
+def shared_cache():
+    """
+    Returns the process-wide MoveCache, made with DEFAULT_ENTRIES entries the first time it is asked for
+    """
+    global _shared
+    if _shared is None:
+        _shared = MoveCache()
+    return _shared
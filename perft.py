@@ -0,0 +1,143 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Perft node counts for ChessVar. Counts every move sequence of a given length from a set of reference
+#               positions and compares the totals with stored counts, reporting nodes per second for each depth.
+#               Run with "python perft.py" before deploying any change to the move rules.
+
+import argparse
+import sys
+import time
+
+from ChessVar import ChessVar
+from attacks import AttackMapChessVar
+from bitboard import BitboardChessVar
+
+# reference positions are move sequences from the starting position, each with its known node counts by depth
+#   the counts were made by trying every start and end square pair with the original make_move
+REFERENCE_POSITIONS = {
+    'start': {
+        'moves': '',
+        'nodes': {1: 20, 2: 400, 3: 9302, 4: 215910},
+    },
+    'development': {
+        'moves': 'g1h3 g7g6 h1g1 a7a6 f2f3 b7b5 b1a3 h7h5 g2g4 f8g7 e2e3 b5b6 g4g3 h8h6 a3b1 g7h8 f1c4 a6a7 g3g4 b6b5 '
+                 'g1h1 c7c6 b1c3 d8a5 f3f2 b5b6 a1b1 b6b5 e3e4 a5b4',
+        'nodes': {1: 36, 2: 1412, 3: 50607},
+    },
+    'middlegame': {
+        'moves': 'g1h3 g7g6 h1g1 a7a6 f2f3 b7b5 b1a3 h7h5 g2g4 f8g7 e2e3 b5b6 g4g3 h8h6 a3b1 g7h8 f1c4 a6a7 g3g4 b6b5 '
+                 'g1h1 c7c6 b1c3 d8a5 f3f2 b5b6 a1b1 b6b5 e3e4 a5b4 a2a4 h5h4 b1a1 c6c5 h1f1 b4b2 c3d5 a7a5 a1a2 e8f8 '
+                 'h2h1 b2d4 d2d3 f7f6 d1d2 b8a6 h3f4 c5c6 a2a3 d4b2 a3a1 c6c7 c4b5 a8a7 a4a3 f6f5 b5c6 f8g7 e4e3 b2e5 '
+                 'c6b7 e5c3 h1h2 g7f6 f4g2 c3c5 e3e4 c5c4 d2d1 h4h5 g2h4 c7c6 c2c3 h5g4 d1b3 a6b8 b3c2 f6g7 d5c7 c4c3',
+        'nodes': {1: 47, 2: 1995, 3: 89722},
+    },
+    # black is down to one knight and one bishop, so many lines end early in a win for white
+    'last_pieces': {
+        'moves': 'e2e3 g7g6 b1c3 d7d5 c3d5 b8c6 g2g3 c8h3 g3g4 a8b8 g1h3 h7h5 f1b5 a7a5 a2a4 f8g7 e1e2 g7b2 d5b4 g8h6 '
+                 'h1g1 h6f5 g1e1 h8g8 e1f1 e8f8 h3g5 e7e8 g5h3 b2f6 h3g5 g6g7 h2h4 c6e5 g5f3 d8d3 g4f5 g7g5 f3g1 d3a3',
+        'nodes': {1: 33, 2: 1253, 3: 41912},
+    },
+}
+
+BACKENDS = {'list': ChessVar, 'bitboard': BitboardChessVar, 'attacks': AttackMapChessVar}
+
+
+def perft(game, depth, bulk=True):
+    """
+    Takes as a parameter a ChessVar game, a depth, and whether the last ply may be counted without playing its moves
+    Returns the number of move sequences of exactly that length, where a won game ends a sequence early
+    Every move played goes through make_move, so a move the generator yields but is_valid rejects raises an error
+    The game is left as it was passed in
+    """
+    if depth == 0:
+        return 1
+    elif depth == 1 and bulk:
+        return sum(1 for _ in game.legal_moves())
+
+    nodes = 0
+    for move in list(game.legal_moves()):
+        _push(game, move)
+        nodes += perft(game, depth - 1, bulk)
+        game.pop()
+    return nodes
+
+
+def divide(game, depth, bulk=True):
+    """
+    Takes as a parameter a ChessVar game, a depth of at least 1, and whether the last ply may be counted without
+    playing its moves
+    Returns a dictionary of each legal move and the perft count below it, for finding which move a count differs on
+    """
+    counts = {}
+    for move in list(game.legal_moves()):
+        _push(game, move)
+        counts[move] = perft(game, depth - 1, bulk)
+        game.pop()
+    return counts
+
+
+def _push(game, move):
+    """
+    Takes as a parameter a ChessVar game and a move from its legal_moves()
+    Pushes the move, raising an error if make_move doesn't accept it
+    """
+    if not game.push(move):
+        raise AssertionError(f'legal_moves() yielded {move[0]}{move[1]} but make_move rejected it')
+
+
+def load_position(name, game_class=ChessVar):
+    """
+    Takes as a parameter the name of a reference position and the ChessVar class to set it up with
+    Returns a new game with the position's moves played
+    """
+    game = game_class()
+    for move in REFERENCE_POSITIONS[name]['moves'].split():
+        if not game.make_move(move[:2], move[2:]):
+            raise ValueError(f'reference position {name} has an illegal move {move}')
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check ChessVar perft counts and report nodes per second.')
+    parser.add_argument('positions', nargs='*', metavar='position',
+                        help='reference positions to run, all of them if none are given: '
+                             + ', '.join(REFERENCE_POSITIONS))
+    parser.add_argument('--depth', type=int, help='deepest depth to run, the deepest stored count if not given')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='list')
+    parser.add_argument('--divide', action='store_true', help='print the count below each move at the last depth')
+    parser.add_argument('--full', action='store_true',
+                        help='play the moves of the last ply through make_move too instead of only counting them')
+    args = parser.parse_args()
+    for name in args.positions:
+        if name not in REFERENCE_POSITIONS:
+            parser.error(f'unknown position {name}')
+
+    failed = False
+    for name in args.positions or REFERENCE_POSITIONS:
+        game = load_position(name, BACKENDS[args.backend])
+        expected = REFERENCE_POSITIONS[name]['nodes']
+        print(name)
+        for depth in range(1, (args.depth or max(expected)) + 1):
+            begin = time.perf_counter()
+            nodes = perft(game, depth, not args.full)
+            elapsed = time.perf_counter() - begin
+            if depth not in expected:
+                result = 'no reference'
+            elif nodes == expected[depth]:
+                result = 'ok'
+            else:
+                result = f'MISMATCH, expected {expected[depth]}'
+                failed = True
+            print(f'  depth {depth}: {nodes:>10} nodes {elapsed:8.2f}s {nodes / max(elapsed, 1e-9):12,.0f} nodes/s  '
+                  f'{result}')
+
+        if args.divide:
+            for move, nodes in sorted(divide(game, args.depth or max(expected), not args.full).items()):
+                print(f'    {move[0]}{move[1]}: {nodes}')
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Streaming validator for ChessVar move logs. Each input line is one game written as squares, either
+#               "e2 e4 d7 d5" or "e2e4 d7d5". Games are replayed through make_move on a pool of worker processes and
+#               each game is reported with the index and reason of its first illegal move and its final game state.
+#               Run with "python replay.py moves.txt" or pipe the logs into "python replay.py".
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+
+from bitboard import BitboardChessVar
+
+# lines sent to a worker at a time
+BATCH_SIZE = 256
+
+
+def parse_moves(line):
+    """
+    Takes as a parameter one line of a move log
+    Returns the list of (start, end) moves on it. A move missing its end square gets an end of ''
+    """
+    tokens = line.split()
+    if all(len(token) == 4 for token in tokens):
+        return [(token[:2], token[2:]) for token in tokens]
+
+    moves = []
+    for index in range(0, len(tokens), 2):
+        moves.append((tokens[index], tokens[index + 1] if index + 1 < len(tokens) else ''))
+    return moves
+
+
+def validate_game(line, game_class=BitboardChessVar):
+    """
+    Takes as a parameter one line of a move log and the ChessVar class to replay it with
+    Returns a dictionary with the number of moves, whether they were all legal, the index and reason of the first
+    illegal move (None if there wasn't one) and the game state after the legal moves
+    """
+    moves = parse_moves(line)
+    game = game_class()
+    for index, (start, end) in enumerate(moves):
+        if not game.make_move(start, end):
+            return {'moves': len(moves), 'valid': False, 'error_index': index,
+                    'reason': game.move_error(start, end), 'game_state': game.get_game_state()}
+    return {'moves': len(moves), 'valid': True, 'error_index': None, 'reason': None,
+            'game_state': game.get_game_state()}
+
+
+def _validate_batch(batch):
+    """
+    Takes as a parameter a list of (line number, line) pairs
+    Returns the list of results for those lines, each with its line number added
+    """
+    results = []
+    for number, line in batch:
+        result = validate_game(line)
+        result['line'] = number
+        results.append(result)
+    return results
+
+
+def validate_stream(lines, workers=None):
+    """
+    Takes as a parameter an iterable of move log lines and the number of worker processes (one per core if None)
+    Yields one result per non-blank line, in input order. Only a few batches are read ahead of the results handed
+    back, so the input can be longer than fits in memory
+    """
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    batches = iter(lambda: list(itertools.islice(numbered, BATCH_SIZE)), [])
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for batch in batches:
+            yield from _validate_batch(batch)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(executor.submit(_validate_batch, batch))
+            if len(pending) >= workers * 2:        # wait for the oldest batch before reading more lines
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay ChessVar move logs and report the first illegal move.')
+    parser.add_argument('log', nargs='?', default='-', help='file of move lists, one game per line, "-" for stdin')
+    parser.add_argument('--workers', type=int, help='worker processes, one per core if not given')
+    parser.add_argument('--invalid-only', action='store_true', help='only print games with an illegal move')
+    args = parser.parse_args()
+
+    lines = sys.stdin if args.log == '-' else open(args.log)
+    games = invalid = 0
+    begin = time.perf_counter()
+    try:
+        for result in validate_stream(lines, args.workers):
+            games += 1
+            if not result['valid']:
+                invalid += 1
+            if not args.invalid_only or not result['valid']:
+                print(json.dumps(result))
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    elapsed = time.perf_counter() - begin
+    print(f'{games} games, {invalid} with an illegal move, {games / max(elapsed, 1e-9):,.1f} games/s',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Self-play game generator for ChessVar. Games are spread across a pool of worker processes and written to
+#               one output stream as JSON lines, in game order, so the same seed always gives the same corpus.
+#               Run with "python selfplay.py --games 1000 --output games.jsonl".
+
+import argparse
+import concurrent.futures
+import json
+import os
+import random
+import sys
+import time
+
+from bitboard import BitboardChessVar
+from engine import ChessVarEngine
+
+# games that go on this long without a winner are stopped and recorded as UNFINISHED
+MAX_PLIES = 400
+
+
+def play_game(index, seed=0, engine_depth=0, random_plies=8, explore=0.1, max_plies=MAX_PLIES):
+    """
+    Takes as a parameter the game's number, the corpus seed, the engine search depth (0 for random moves only), how
+    many opening plies to play at random before the engine takes over, the chance of a random move after that so
+    engine games don't repeat themselves, and the most plies to play
+    Returns a dictionary recording the game. The same index and seed always give the same game, whichever worker
+    plays it
+    """
+    rng = random.Random(seed * 2 ** 32 + index)
+    game = BitboardChessVar()
+    engine = ChessVarEngine(max_depth=engine_depth, table_bytes=1024 * 1024) if engine_depth > 0 else None
+    moves = []
+
+    while game.get_game_state() == 'UNFINISHED' and len(moves) < max_plies:
+        if engine is not None and len(moves) >= random_plies and rng.random() >= explore:
+            move = engine.best_move(game)
+        else:
+            legal = list(game.legal_moves())
+            move = rng.choice(legal) if legal else None
+        if move is None:        # the player to move has no legal moves left
+            break
+        game.make_move(*move)
+        moves.append(move[0] + move[1])
+
+    return {'game': index, 'seed': seed, 'result': game.get_game_state(), 'plies': len(moves), 'moves': ' '.join(moves)}
+
+
+def _play_game_args(args):
+    """
+    Takes as a parameter a tuple of play_game arguments, since executor.map passes one argument per call
+    """
+    return play_game(*args)
+
+
+def generate(games, output, seed=0, workers=None, engine_depth=0, random_plies=8, explore=0.1, max_plies=MAX_PLIES):
+    """
+    Takes as a parameter the number of games, a text stream to write to, the corpus seed, the number of worker
+    processes (one per core if None) and the play_game settings
+    Writes one JSON line per game, in game order, as games finish. Returns the number of games written
+    """
+    jobs = ((index, seed, engine_depth, random_plies, explore, max_plies) for index in range(games))
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, min(64, games // (workers * 8)))
+    written = 0
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        # executor.map hands results back in the order the games were submitted, so the corpus doesn't depend on
+        #   which worker happens to finish first
+        for record in executor.map(_play_game_args, jobs, chunksize=chunk_size):
+            output.write(json.dumps(record) + '\n')
+            written += 1
+    output.flush()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate ChessVar self-play games.')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help='worker processes, one per core if not given')
+    parser.add_argument('--engine-depth', type=int, default=0, help='search depth of the engine, 0 for random play')
+    parser.add_argument('--random-plies', type=int, default=8,
+                        help='opening plies played at random before the engine takes over')
+    parser.add_argument('--explore', type=float, default=0.1,
+                        help='chance of a random move instead of the engine move after the opening')
+    parser.add_argument('--max-plies', type=int, default=MAX_PLIES)
+    parser.add_argument('--output', default='-', help='file to write to, standard output if "-"')
+    args = parser.parse_args()
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    begin = time.perf_counter()
+    try:
+        written = generate(args.games, output, args.seed, args.workers, args.engine_depth, args.random_plies,
+                           args.explore, args.max_plies)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - begin
+    print(f'{written} games in {elapsed:.2f}s, {written / elapsed:,.1f} games/s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
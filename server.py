@@ -0,0 +1,269 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: asyncio server hosting many ChessVar games in one process. Clients send one JSON object per line over
+#               TCP or a Unix socket and get one JSON object back per request. Idle games are evicted, and move
+#               validation can be sent to a pool of worker processes to keep the event loop free.
+#               Run with "python server.py --port 8765" or "python server.py --unix /tmp/chessvar.sock".
+#
+# Requests, each answered with "ok" set to true or false (with an "error") and any "id" the request carried:
+#   {"op": "create"}                                        -> {"game": id}
+#   {"op": "move", "game": id, "start": "e2", "end": "e4"}  -> {"valid": bool, "reason": str/null, "game_state": str}
+#       start and end may also be square indexes, a1 = 0 through h8 = 63, to skip parsing square names
+#   {"op": "state", "game": id}                             -> {"game_state": str, "turn": "white"/"black"}
+#   {"op": "legal", "game": id}                             -> {"moves": ["e2e4", ...]}
+#   {"op": "hint", "game": id}                              -> {"moves": [{"move": "e2e4", "games": int, "wins": int,
+#                                                                "draws": int, "losses": int}, ...]}
+#       opening book moves for the player to move, most played first, empty without a --book or out of book
+#   {"op": "close", "game": id}                             -> {}
+
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import time
+
+from ChessVar import SQUARE_INDEX, MOVE_OK, MOVE_RESULTS
+from book import OpeningBook
+from movecache import MoveCache
+from session import GameSession
+
+# longest request line accepted, in bytes
+MAX_LINE = 4096
+
+
+def _pool_move(session, start, end):
+    """
+    Takes as a parameter a GameSession and the start and end square indexes
+    Makes the move in a worker process and returns (session, result), the session changed if the move was made
+    """
+    return session, session.move_index(start, end)
+
+
+def _square_index(square):
+    """
+    Takes as a parameter a square from a request, a name such as 'e2' or an index
+    Returns the square index, -1 if it isn't a square, or None if it is neither a string nor an integer
+    """
+    if isinstance(square, str):
+        return SQUARE_INDEX.get(square, -1)
+    if isinstance(square, int) and not isinstance(square, bool):
+        return square
+    return None
+
+
+class _HostedGame:
+    """
+    This class represents a hosted game with the time it was last used and, while a move is out at the worker pool,
+    a lock so that moves on one game are made in order.
+    """
+
+    __slots__ = ('session', 'last_used', 'lock')
+
+    def __init__(self, session):
+        self.session = session
+        self.last_used = time.monotonic()
+        self.lock = None
+
+
+class GameServer:
+    """
+    This class represents a server hosting many games.
+    """
+
+    def __init__(self, idle_timeout=600, workers=0, book=None, move_cache=None):
+        """
+        Takes as a parameter how many seconds a game may go unused before it is evicted, the number of worker
+        processes to validate moves in (0 to validate them on the event loop), optionally a book.OpeningBook to
+        answer hints from, and optionally a movecache.MoveCache shared by every game to answer legal move requests from
+        """
+        self._games = {}
+        self._ids = itertools.count(1)
+        self._idle_timeout = idle_timeout
+        self._pool = concurrent.futures.ProcessPoolExecutor(workers) if workers else None
+        self._book = book
+        self._move_cache = move_cache
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._games)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Takes as a parameter the stream reader and writer of a client connection
+        Answers the client's requests one line at a time until it disconnects. Waiting for each response to drain
+        before reading the next request keeps a slow client from piling up responses in memory
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:      # the line was longer than MAX_LINE
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line):
+        """
+        Takes as a parameter one request line
+        Returns the response dictionary
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError
+        except ValueError:
+            return {'ok': False, 'error': 'request is not a JSON object'}
+
+        response = await self._dispatch(request)
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    async def _dispatch(self, request):
+        """
+        Takes as a parameter a request dictionary
+        Returns the response dictionary
+        """
+        op = request.get('op')
+        if op == 'create':
+            game_id = str(next(self._ids))
+            self._games[game_id] = _HostedGame(GameSession())
+            return {'ok': True, 'game': game_id}
+
+        hosted = self._games.get(request.get('game'))
+        if op not in ('move', 'state', 'legal', 'hint', 'close'):
+            return {'ok': False, 'error': f'unknown op {op!r}'}
+        if hosted is None:
+            return {'ok': False, 'error': 'no such game'}
+        hosted.last_used = time.monotonic()
+
+        if op == 'move':
+            start = _square_index(request.get('start'))
+            end = _square_index(request.get('end'))
+            if start is None or end is None:
+                return {'ok': False, 'error': 'move needs a start and end square'}
+            result = await self._make_move(hosted, start, end)
+            return {'ok': True, 'valid': result == MOVE_OK, 'reason': MOVE_RESULTS[result],
+                    'game_state': hosted.session.get_game_state()}
+        elif op == 'state':
+            return {'ok': True, 'game_state': hosted.session.get_game_state(),
+                    'turn': hosted.session.get_current_turn()}
+        elif op == 'legal':
+            if self._move_cache is not None:
+                moves = self._move_cache.legal_moves(hosted.session)
+            else:
+                moves = hosted.session.legal_moves()
+            return {'ok': True, 'moves': [start + end for start, end in moves]}
+        elif op == 'hint':
+            candidates = self._book.probe(hosted.session) if self._book is not None else []
+            return {'ok': True, 'moves': [{'move': start + end, 'games': games, 'wins': wins, 'draws': draws,
+                                           'losses': losses}
+                                          for (start, end), games, wins, draws, losses in candidates]}
+        else:
+            del self._games[request['game']]
+            return {'ok': True}
+
+    async def _make_move(self, hosted, start, end):
+        """
+        Takes as a parameter a hosted game and the start and end square indexes
+        Makes the move on the event loop, or at the worker pool if there is one, and returns the move_index result code
+        """
+        if self._pool is None:
+            return hosted.session.move_index(start, end)
+
+        if hosted.lock is None:
+            hosted.lock = asyncio.Lock()
+        async with hosted.lock:
+            loop = asyncio.get_running_loop()
+            session, result = await loop.run_in_executor(self._pool, _pool_move, hosted.session, start, end)
+            hosted.session = session
+        return result
+
+    def evict_idle(self):
+        """
+        Removes every game that hasn't been used within the idle timeout
+        Returns the number of games removed
+        """
+        cutoff = time.monotonic() - self._idle_timeout
+        idle = [game_id for game_id, hosted in self._games.items() if hosted.last_used < cutoff]
+        for game_id in idle:
+            del self._games[game_id]
+        self.evicted += len(idle)
+        return len(idle)
+
+    async def _evict_forever(self):
+        """
+        Evicts idle games every tenth of the idle timeout, or every second if that is shorter
+        """
+        while True:
+            await asyncio.sleep(max(1, self._idle_timeout / 10))
+            self.evict_idle()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        """
+        Takes as a parameter the host and port to listen on, or the path of a Unix socket to listen on instead
+        Serves clients until cancelled
+        """
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, unix_path, limit=MAX_LINE, backlog=4096)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE, backlog=4096)
+
+        evictor = asyncio.create_task(self._evict_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+
+
+def raise_open_file_limit():
+    """
+    Raises this process's open file limit as far as allowed, since every connection needs a file descriptor
+    """
+    try:
+        import resource
+    except ImportError:     # not available on Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Host ChessVar games over TCP or a Unix socket.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='path of a Unix socket to listen on instead of TCP')
+    parser.add_argument('--workers', type=int, default=0, help='worker processes for move validation, 0 for none')
+    parser.add_argument('--idle-timeout', type=float, default=600, help='seconds before an unused game is evicted')
+    parser.add_argument('--book', help='opening book file from book.py to answer hints from')
+    parser.add_argument('--move-cache', type=int, default=0, help='positions to cache legal moves for, 0 for none')
+    args = parser.parse_args()
+
+    raise_open_file_limit()
+    book = OpeningBook(args.book) if args.book else None
+    server = GameServer(args.idle_timeout, args.workers, book, MoveCache(args.move_cache) if args.move_cache else None)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if book is not None:
+            book.close()
+
+
+if __name__ == '__main__':
+    main()
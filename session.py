@@ -0,0 +1,240 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Lightweight game session for hosting many ChessVar games at once. A session keeps its position in two
+#               small bytearrays and has no per-game lookup tables, every table it uses is shared at module level.
+#               Sessions play by the same rules as ChessVar and give the same make_move results and position keys.
+
+from ChessVar import (ChessVar, SQUARE_NAMES, SQUARE_INDEX, PIECE_CODES, CODE_PIECES, GAME_STATES, ZOBRIST_KEYS,
+                      ZOBRIST_BLACK_TO_MOVE, KNIGHT_STEPS, KING_STEPS, DIAGONAL_STEPS, SLIDING_STEPS, MOVE_OK,
+                      MOVE_BAD_SQUARE, MOVE_GAME_OVER, MOVE_EMPTY_SQUARE, MOVE_WRONG_TURN, MOVE_OWN_PIECE_TARGET,
+                      MOVE_ILLEGAL, MOVE_RESULTS, BAD_SQUARE, CHECK_ONLY, PIECE_TYPES, MOVE_RULES, UNREACHABLE,
+                      REACHABLE, CLEAR_PATH, EMPTY_PATH, CAPTURE)
+from bitboard import BETWEEN
+
+WHITE = 0
+BLACK = 1
+
+# CODE_COLORS[code] is the player a piece code belongs to and CODE_LETTERS[code] its type letter
+CODE_COLORS = (None,) + (WHITE,) * 6 + (BLACK,) * 6
+CODE_LETTERS = tuple(piece[1:] for piece in CODE_PIECES)
+CODE_TYPES = (None,) + tuple(PIECE_TYPES[piece[1]] for piece in CODE_PIECES[1:])
+
+# ZOBRIST_SQUARE_KEYS[code][square] is the same key ChessVar uses for that piece on that square
+ZOBRIST_SQUARE_KEYS = [[0] * 64] + [[ZOBRIST_KEYS[piece][square & 7][square >> 3] for square in range(64)]
+                                    for piece in CODE_PIECES[1:]]
+
+# BETWEEN_SQUARES[start * 64 + end] lists the square indexes strictly between two squares on the same line
+BETWEEN_SQUARES = [tuple(square for square in range(64) if mask >> square & 1) for mask in BETWEEN]
+
+# the starting position, copied into every new session
+_start = ChessVar()
+START_BOARD = bytes(PIECE_CODES[_start._board[square & 7][square >> 3]] for square in range(64))
+START_COUNTS = bytes([0] + [START_BOARD.count(code) for code in range(1, len(CODE_PIECES))])
+START_KEY = _start.position_key()
+del _start
+
+
+class GameSession:
+    """
+    This class represents one hosted game, stored as a bytearray of piece codes by square and a bytearray of piece
+    counts by piece code.
+    """
+
+    __slots__ = ('_board', '_counts', '_turn', '_state', '_key')
+
+    def __init__(self):
+        self._board = bytearray(START_BOARD)
+        self._counts = bytearray(START_COUNTS)
+        self._turn = WHITE
+        self._state = 0         # index into GAME_STATES
+        self._key = START_KEY
+
+    @classmethod
+    def from_game(cls, game):
+        """
+        Takes as a parameter a ChessVar game
+        Returns a session in the same position
+        """
+        session = cls.__new__(cls)
+        session._board = bytearray(PIECE_CODES[game._board[square & 7][square >> 3]] for square in range(64))
+        session._counts = bytearray([0] + [session._board.count(code) for code in range(1, len(CODE_PIECES))])
+        session._turn = WHITE if game._current_turn == 'white' else BLACK
+        session._state = GAME_STATES.index(game._game_state)
+        session._key = game.position_key()
+        return session
+
+    def to_game(self, game_class=ChessVar):
+        """
+        Takes as a parameter the ChessVar class to build
+        Returns a new game in the same position as this session
+        """
+        board = [[CODE_PIECES[self._board[y * 8 + x]] for y in range(8)] for x in range(8)]
+        game = game_class()
+        game.set_position(board, 'white' if self._turn == WHITE else 'black', GAME_STATES[self._state])
+        return game
+
+    def clone(self):
+        """
+        Returns a new session in the same position, copying only the two bytearrays
+        """
+        session = GameSession.__new__(GameSession)
+        session._board = self._board[:]
+        session._counts = self._counts[:]
+        session._turn = self._turn
+        session._state = self._state
+        session._key = self._key
+        return session
+
+    def get_game_state(self):
+        """
+        Returns one of the game states: ('UNFINISHED', 'WHITE_WON', 'BLACK_WON')
+        """
+        return GAME_STATES[self._state]
+
+    def get_current_turn(self):
+        """
+        Returns the player to move, 'white' or 'black'
+        """
+        return 'white' if self._turn == WHITE else 'black'
+
+    def position_key(self):
+        """
+        Returns the 64-bit Zobrist key of the current position, the same key ChessVar gives for it
+        """
+        return self._key
+
+    def make_move(self, start, end):
+        """
+        Takes a parameter the intended piece to move and destination
+        Returns True or False depending on if a player's move is valid
+        """
+        start_square = SQUARE_INDEX.get(start)
+        end_square = SQUARE_INDEX.get(end)
+        if start_square is None or end_square is None:
+            return False
+        return self.move_index(start_square, end_square) == MOVE_OK
+
+    def move_error(self, start, end):
+        """
+        Takes as a parameter the intended piece to move and destination
+        Returns the reason make_move would reject the move, the same reason ChessVar.move_error gives, or None if it
+        would accept it. The session isn't changed
+        """
+        start_square = SQUARE_INDEX.get(start)
+        end_square = SQUARE_INDEX.get(end)
+        if start_square is None or end_square is None:
+            return BAD_SQUARE
+        return MOVE_RESULTS[self.move_index(start_square, end_square, CHECK_ONLY)]
+
+    def move_index(self, start, end, flags=0):
+        """
+        Takes as a parameter the start and end square indexes (a1 = 0 through h8 = 63) and optionally CHECK_ONLY to
+        check the move without making it
+        Makes the move and returns MOVE_OK, or returns the result code of the reason the move was rejected
+        """
+        if not 0 <= start < 64 or not 0 <= end < 64:
+            return MOVE_BAD_SQUARE
+        if self._state != 0:
+            return MOVE_GAME_OVER
+
+        board = self._board
+        piece = board[start]
+        target = board[end]
+        if piece == 0:
+            return MOVE_EMPTY_SQUARE
+        if CODE_COLORS[piece] != self._turn:
+            return MOVE_WRONG_TURN
+        if target != 0 and CODE_COLORS[target] == self._turn:       # also rules out the start square itself
+            return MOVE_OWN_PIECE_TARGET
+        if not self._is_valid_square(start, end, CODE_TYPES[piece]):
+            return MOVE_ILLEGAL
+        if flags & CHECK_ONLY:
+            return MOVE_OK
+
+        key = self._key ^ ZOBRIST_SQUARE_KEYS[piece][start] ^ ZOBRIST_SQUARE_KEYS[piece][end]
+        if target != 0:
+            key ^= ZOBRIST_SQUARE_KEYS[target][end]
+            self._counts[target] -= 1
+            if self._counts[target] == 0:       # the last piece of its type was captured, its owner loses
+                self._state = 2 if CODE_COLORS[target] == WHITE else 1
+        board[end] = piece
+        board[start] = 0
+        self._key = key ^ ZOBRIST_BLACK_TO_MOVE
+        self._turn ^= 1
+        return MOVE_OK
+
+    def _is_valid_square(self, start, end, piece):
+        """
+        Takes as a parameter the starting and ending square indexes and piece which holds its type
+        Checks if a move is valid by looking up what the move needs in MOVE_RULES, the same table ChessVar uses
+        """
+        rule = MOVE_RULES[piece][start * 64 + end]
+        if rule == REACHABLE:
+            return True
+        elif rule == UNREACHABLE:
+            return False
+
+        board = self._board
+        if rule == CLEAR_PATH or rule == EMPTY_PATH:
+            for square in BETWEEN_SQUARES[start * 64 + end]:
+                if board[square] != 0:
+                    return False
+            if rule == CLEAR_PATH:
+                return True
+        if rule == CAPTURE:     # pawns only move diagonally to capture
+            return board[end] != 0
+        return board[end] == 0
+
+    def legal_moves(self):
+        """
+        Yields every legal move for the current player as a (start, end) tuple of squares
+        Yields nothing once the game has been won
+        """
+        if self._state != 0:
+            return
+
+        board = self._board
+        for square in range(64):
+            piece = board[square]
+            if piece == 0 or CODE_COLORS[piece] != self._turn:
+                continue
+
+            start = SQUARE_NAMES[square]
+            x = square & 7
+            y = square >> 3
+            letter = CODE_LETTERS[piece]
+            if letter in SLIDING_STEPS:
+                for step_x, step_y in SLIDING_STEPS[letter]:
+                    end_x = x + step_x
+                    end_y = y + step_y
+                    while 0 <= end_x < 8 and 0 <= end_y < 8:
+                        target = board[end_y * 8 + end_x]
+                        if target == 0 or CODE_COLORS[target] != self._turn:
+                            yield start, SQUARE_NAMES[end_y * 8 + end_x]
+                        if target != 0:
+                            break
+                        end_x += step_x
+                        end_y += step_y
+            elif letter == 'p':
+                for step_y in (1, -1):
+                    end_y = y + step_y
+                    if 0 <= end_y < 8 and board[end_y * 8 + x] == 0:
+                        yield start, SQUARE_NAMES[end_y * 8 + x]
+                        if (y == 1 and step_y == 1 or y == 6 and step_y == -1) and board[(end_y + step_y) * 8 + x] == 0:
+                            yield start, SQUARE_NAMES[(end_y + step_y) * 8 + x]
+                for step_x, step_y in DIAGONAL_STEPS:
+                    end_x = x + step_x
+                    end_y = y + step_y
+                    if 0 <= end_x < 8 and 0 <= end_y < 8:
+                        target = board[end_y * 8 + end_x]
+                        if target != 0 and CODE_COLORS[target] != self._turn:
+                            yield start, SQUARE_NAMES[end_y * 8 + end_x]
+            else:
+                for step_x, step_y in KNIGHT_STEPS if letter == 'h' else KING_STEPS:
+                    end_x = x + step_x
+                    end_y = y + step_y
+                    if 0 <= end_x < 8 and 0 <= end_y < 8:
+                        target = board[end_y * 8 + end_x]
+                        if target == 0 or CODE_COLORS[target] != self._turn:
+                            yield start, SQUARE_NAMES[end_y * 8 + end_x]
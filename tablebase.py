@@ -0,0 +1,511 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Endgame tablebases for ChessVar positions with few pieces, built by retrograde analysis. Each table
+#               holds every position of one set of pieces with one byte giving the result with best play and the number
+#               of plies until the game ends. Tables are files read through mmap, so probing a position is one index
+#               calculation and one byte read. Needs numpy to build tables, but not to probe them.
+#               Run with "python tablebase.py generate qkvrk" or "python tablebase.py generate --pieces 3".
+#
+# Positions set up with set_position() are played with only the piece types on the board, so in a table's positions
+# capturing the last piece of any type a player has wins the game. Tables are named by their pieces, white's letters,
+# then "v", then black's letters, each in the order p, r, h, b, q, k: "qkvrk" is queen and king against rook and king.
+
+import argparse
+import itertools
+import mmap
+import os
+import struct
+import time
+
+from ChessVar import PIECE_CODES, CODE_PIECES
+from bitboard import BETWEEN
+
+MAX_PIECES = 5
+
+# table file layout: a header, then one byte per position
+#   header: magic, format version, number of pieces, piece codes in ascending order padded to MAX_PIECES bytes
+#   value: 0 for a draw, otherwise the number of plies until the game ends, odd when the player to move wins it and
+#          even when they lose it
+MAGIC = b'CVTB'
+VERSION = 1
+HEADER = struct.Struct('<4sHB5s')
+MAX_DISTANCE = 255
+
+PIECE_LETTERS = 'prhbqk'
+
+# positions whose predecessors are found at once while building a table, to bound the memory it takes
+FRONTIER_CHUNK = 1 << 18
+
+
+def material_name(material):
+    """
+    Takes as a parameter a tuple of piece codes in ascending order
+    Returns the table name of those pieces, such as 'qkvrk'
+    """
+    white = ''.join(CODE_PIECES[code][1] for code in material if CODE_PIECES[code][0] == 'w')
+    black = ''.join(CODE_PIECES[code][1] for code in material if CODE_PIECES[code][0] == 'b')
+    return white + 'v' + black
+
+
+def parse_material(name):
+    """
+    Takes as a parameter a table name such as 'qkvrk'
+    Returns the tuple of piece codes in ascending order, raising ValueError if the name isn't a table name
+    """
+    white, separator, black = name.partition('v')
+    if not separator or not white or not black or any(letter not in PIECE_LETTERS for letter in white + black):
+        raise ValueError(f'{name!r} is not a table name such as "qkvrk"')
+    material = tuple(sorted([PIECE_CODES['w' + letter] for letter in white] +
+                            [PIECE_CODES['b' + letter] for letter in black]))
+    if len(material) > MAX_PIECES:
+        raise ValueError(f'tables have at most {MAX_PIECES} pieces, {name!r} has {len(material)}')
+    return material
+
+
+def all_materials(pieces):
+    """
+    Takes as a parameter the most pieces a table may have
+    Returns every material with both players on the board and at most that many pieces, smallest first
+    """
+    materials = []
+    for count in range(2, pieces + 1):
+        for white_count in range(1, count):
+            for white in itertools.combinations_with_replacement(range(1, 7), white_count):
+                for black in itertools.combinations_with_replacement(range(7, 13), count - white_count):
+                    materials.append(white + black)
+    return materials
+
+
+def table_size(count):
+    """
+    Takes as a parameter the number of pieces
+    Returns the number of positions in a table with that many pieces, for both players to move
+    The first piece is kept on files a to d, since mirroring a position left to right doesn't change its result
+    """
+    return 2 * 32 * 64 ** (count - 1)
+
+
+def position_index(squares, turn):
+    """
+    Takes as a parameter the square indexes of a position's pieces, in the order of its table's piece codes, and the
+    player to move (0 white, 1 black)
+    Returns the position's index in its table
+    """
+    if squares[0] & 7 >= 4:
+        squares = [square ^ 7 for square in squares]
+    index = (squares[0] >> 3) * 4 + (squares[0] & 7)
+    for square in squares[1:]:
+        index = index * 64 + square
+    return turn * table_size(len(squares)) // 2 + index
+
+
+def table_path(directory, material):
+    """
+    Takes as a parameter a tablebase directory and a material tuple
+    Returns the path of that material's table file
+    """
+    return os.path.join(directory, material_name(material) + '.cvtb')
+
+
+def _smaller_materials(material):
+    """
+    Takes as a parameter a material tuple
+    Returns the materials a capture can leave without ending the game, one for each piece code with more than one piece
+    """
+    return [material[:number] + material[number + 1:] for number, code in enumerate(material)
+            if material.count(code) > 1 and material.index(code) == number]
+
+
+class Tablebase:
+    """
+    This class represents a directory of table files, each opened through mmap the first time it is probed.
+    """
+
+    def __init__(self, directory):
+        """
+        Takes as a parameter the directory holding the table files
+        """
+        self._directory = directory
+        self._tables = {}
+
+    def _table(self, material):
+        """
+        Takes as a parameter a material tuple
+        Returns the mmap of its table file, or None if there is no table for it
+        """
+        if material not in self._tables:
+            try:
+                with open(table_path(self._directory, material), 'rb') as file:
+                    table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except FileNotFoundError:
+                table = None
+            if table is not None:
+                magic, version, count, codes = HEADER.unpack_from(table, 0)
+                if magic != MAGIC or version != VERSION or tuple(codes[:count]) != material:
+                    raise ValueError(f'{table_path(self._directory, material)} is not a table for '
+                                     f'{material_name(material)}')
+            self._tables[material] = table
+        return self._tables[material]
+
+    def probe(self, game):
+        """
+        Takes as a parameter a ChessVar game
+        Returns the number of plies until the game ends with best play, positive if the player to move wins and negative
+        if they lose, 0 for a draw, or None if the game is over or there is no table for its pieces
+        """
+        if game._game_state != 'UNFINISHED':
+            return None
+        if sum(game._white_count.values()) + sum(game._black_count.values()) > MAX_PIECES:
+            return None
+
+        pieces = []
+        for x, column in enumerate(game._board):
+            for y, piece in enumerate(column):
+                if piece != '':
+                    pieces.append((PIECE_CODES[piece], y * 8 + x))
+        pieces.sort()
+        table = self._table(tuple(code for code, _ in pieces))
+        if table is None:
+            return None
+
+        value = table[HEADER.size + position_index([square for _, square in pieces], game._current_turn == 'black')]
+        return value if value % 2 else -value
+
+    def best_move(self, game):
+        """
+        Takes as a parameter a ChessVar game
+        Returns (move, plies) for the move that wins soonest, or failing that draws, or failing that loses latest, with
+        plies as probe() gives it for the position before the move. Returns None if the position can't be probed
+        """
+        if self.probe(game) is None:
+            return None
+
+        best = None
+        best_rank = None
+        for move in list(game.legal_moves()):
+            game.push(move)
+            if game._game_state != 'UNFINISHED':
+                plies = 1       # the move captured the last piece of a type
+            else:
+                child = self.probe(game)
+                plies = None if child is None else -child + 1 if child < 0 else -child - 1 if child > 0 else 0
+            game.pop()
+            if plies is None:
+                continue
+
+            rank = (2, -plies) if plies > 0 else (1, 0) if plies == 0 else (0, -plies)
+            if best_rank is None or rank > best_rank:
+                best = (move, plies)
+                best_rank = rank
+        return best
+
+    def close(self):
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _decode(indexes, count):
+    """
+    Takes as a parameter an array of indexes into one player's half of a table and the number of pieces
+    Returns the list of each piece's square index arrays
+    """
+    squares = []
+    for _ in range(count - 1):
+        squares.append(indexes % 64)
+        indexes = indexes // 64
+    squares.append((indexes >> 2) * 8 + (indexes & 3))
+    return squares[::-1]
+
+
+def _encode(squares, turn, count):
+    """
+    Takes as a parameter the list of each piece's square index arrays, the player to move and the number of pieces
+    Returns the array of the positions' indexes in their table, mirrored so the first piece is on files a to d
+    """
+    import numpy as np
+
+    mirror = (squares[0] & 7) >= 4
+    squares = [np.where(mirror, square ^ 7, square) for square in squares]
+    index = (squares[0] >> 3) * 4 + (squares[0] & 7)
+    for square in squares[1:]:
+        index = index * 64 + square
+    return index + turn * table_size(count) // 2
+
+
+def _occupied(squares):
+    """
+    Takes as a parameter the list of each piece's square index arrays
+    Returns the array of the positions' occupied squares as 64-bit masks
+    """
+    import numpy as np
+
+    occupied = np.zeros(squares[0].size, dtype=np.uint64)
+    for square in squares:
+        occupied |= np.left_shift(np.uint64(1), square.astype(np.uint64))
+    return occupied
+
+
+def _quiet_moves(rules):
+    """
+    Takes as a parameter a piece kind's MOVE_RULES array
+    Returns a list for each start square of (end, mask) pairs, one for each move that doesn't capture, where mask has
+    the bits of the squares the move needs to be empty: the end square and every square in between
+    """
+    from batch import REACHABLE, CLEAR_PATH, EMPTY_TARGET, EMPTY_PATH
+
+    moves = [[] for _ in range(64)]
+    for start in range(64):
+        for end in range(64):
+            if rules[start, end] in (REACHABLE, CLEAR_PATH, EMPTY_TARGET, EMPTY_PATH):
+                moves[start].append((end, BETWEEN[start * 64 + end] | 1 << end))
+    return moves
+
+
+def build_table(material, smaller):
+    """
+    Takes as a parameter a material tuple and a dictionary with the values of every table in _smaller_materials()
+    Returns the uint8 array of values of every position with those pieces
+    """
+    import numpy as np
+    from batch import MOVE_RULES, BETWEEN_BITS, CODE_KINDS, REACHABLE, CLEAR_PATH, CAPTURE
+
+    count = len(material)
+    half = table_size(count) // 2
+    shape = (32,) + (64,) * (count - 1)
+    kinds = [CODE_KINDS[code] for code in material]
+    sides = [0 if CODE_PIECES[code][0] == 'w' else 1 for code in material]
+    squares = _decode(np.arange(half, dtype=np.int64), count)
+    occupied = _occupied(squares)
+    valid = np.ones(half, dtype=bool)
+    for first, second in itertools.combinations(squares, 2):
+        valid &= first != second
+
+    # quiet_moves[kind][start] lists each move from start that doesn't capture, quiet_unmoves[kind][end] each move to
+    # end, with the squares that must be empty before the move or after it
+    quiet_moves = {kind: _quiet_moves(MOVE_RULES[kind]) for kind in set(kinds)}
+    quiet_unmoves = {}
+    for kind, moves in quiet_moves.items():
+        quiet_unmoves[kind] = [[] for _ in range(64)]
+        for start in range(64):
+            for end, _ in moves[start]:
+                quiet_unmoves[kind][end].append((start, BETWEEN[start * 64 + end] | 1 << start))
+
+    values = np.zeros(2 * half, dtype=np.uint8)
+    remaining = np.zeros(2 * half, dtype=np.uint8)      # quiet moves not yet known to lose
+    capture_win = np.zeros(2 * half, dtype=np.uint8)    # fewest plies to win by a capture, 0 if none wins
+    capture_loss = np.zeros(2 * half, dtype=np.uint8)   # most plies to lose after a capture, 0 if none loses
+    capture_draw = np.zeros(2 * half, dtype=bool)
+    for turn in (0, 1):
+        base = turn * half
+        moves_left = remaining[base:base + half].reshape(shape)
+        board = occupied.reshape(shape)
+        for piece in range(count):
+            if sides[piece] != turn:
+                continue
+
+            # count the piece's quiet moves one start square at a time, so each move needs one fixed mask of squares
+            for position in range(shape[piece]):
+                start = (position >> 2) * 8 + (position & 3) if piece == 0 else position
+                where = (slice(None),) * piece + (position,)
+                for end, mask in quiet_moves[kinds[piece]][start]:
+                    moves_left[where] += board[where] & np.uint64(mask) == 0
+
+            rules = MOVE_RULES[kinds[piece]]
+            for victim in range(count):
+                if sides[victim] == turn:
+                    continue
+                rule = rules[squares[piece], squares[victim]]
+                clear = BETWEEN_BITS[squares[piece] * 64 + squares[victim]] & occupied == 0
+                rows = np.flatnonzero(valid & ((rule == REACHABLE) | (rule == CAPTURE) | ((rule == CLEAR_PATH) & clear)))
+                if material.count(material[victim]) == 1:
+                    capture_win[base + rows] = 1
+                    continue
+
+                # the capture leaves a smaller table's position with the other player to move
+                child_squares = [square[rows] for square in squares]
+                child_squares[piece] = squares[victim][rows]
+                del child_squares[victim]
+                child = smaller[material[:victim] + material[victim + 1:]][_encode(child_squares, 1 - turn, count - 1)]
+                child = child.astype(np.int64) + 1
+                if child.size and child.max() > MAX_DISTANCE:
+                    raise ValueError(f'{material_name(material)} has a result more than {MAX_DISTANCE} plies away')
+                wins = (child % 2 == 1) & (child > 1)       # the child's player to move loses, so this capture wins
+                better = wins & ((capture_win[base + rows] == 0) | (capture_win[base + rows] > child))
+                capture_win[base + rows[better]] = child[better]
+                losses = (child % 2 == 0) & (child > 1)
+                capture_loss[base + rows[losses]] = np.maximum(capture_loss[base + rows[losses]], child[losses])
+                capture_draw[base + rows[child == 1]] = True
+    del squares, occupied
+
+    valid = np.concatenate((valid, valid))
+    known = ~valid
+    buckets = {}
+
+    def schedule(distance, indexes):
+        if indexes.size:
+            if distance > MAX_DISTANCE:
+                raise ValueError(f'{material_name(material)} has a result more than {MAX_DISTANCE} plies away')
+            buckets.setdefault(distance, []).append(indexes)
+
+    def schedule_losses(indexes):
+        for distance in np.unique(capture_loss[indexes]):
+            schedule(int(distance), indexes[capture_loss[indexes] == distance])
+
+    for distance in np.unique(capture_win[valid]):
+        if distance:
+            schedule(int(distance), np.flatnonzero(valid & (capture_win == distance)))
+    schedule_losses(np.flatnonzero(valid & (remaining == 0) & (capture_win == 0) & ~capture_draw & (capture_loss > 0)))
+
+    def unmoves(indexes):
+        """
+        Returns the indexes of every position one quiet move before the given ones, once for each move
+        """
+        parents = []
+        for turn in (0, 1):
+            children = indexes[indexes // half == turn] % half
+            child_squares = _decode(children, count)
+            child_occupied = _occupied(child_squares)
+            for piece in range(count):
+                if sides[piece] == turn:
+                    continue
+
+                # group the positions by the piece's square, so each move into that square needs one fixed mask
+                order = np.argsort(child_squares[piece], kind='stable')
+                bounds = np.searchsorted(child_squares[piece][order], np.arange(65))
+                rows = []
+                starts = []
+                for end in range(64):
+                    group = order[bounds[end]:bounds[end + 1]]
+                    if group.size == 0:
+                        continue
+                    group_occupied = child_occupied[group]
+                    for start, mask in quiet_unmoves[kinds[piece]][end]:
+                        found = group[group_occupied & np.uint64(mask) == 0]
+                        rows.append(found)
+                        starts.append(np.full(found.size, start, dtype=np.int64))
+                if rows:
+                    rows = np.concatenate(rows)
+                    parent_squares = [square[rows] for square in child_squares]
+                    parent_squares[piece] = np.concatenate(starts)
+                    parents.append(_encode(parent_squares, 1 - turn, count))
+        return np.concatenate(parents) if parents else np.zeros(0, dtype=np.int64)
+
+    distance = 0
+    while buckets:
+        distance += 1
+        if distance not in buckets:
+            continue
+        frontier = np.unique(np.concatenate(buckets.pop(distance)))
+        frontier = frontier[~known[frontier]]
+        known[frontier] = True
+        values[frontier] = distance
+
+        for first in range(0, frontier.size, FRONTIER_CHUNK):
+            parents = unmoves(frontier[first:first + FRONTIER_CHUNK])
+            if distance % 2 == 0:
+                # the player to move in these positions loses, so a move into one of them wins
+                parents = np.unique(parents[~known[parents]])
+                schedule(distance + 1, parents)
+            else:
+                # one more of the parents' moves loses, and a parent whose every move loses loses too
+                parents, moves = np.unique(parents, return_counts=True)
+                remaining[parents] -= moves.astype(np.uint8)
+                lost = parents[(remaining[parents] == 0) & ~known[parents] & (capture_win[parents] == 0)
+                               & ~capture_draw[parents]]
+                capture_loss[lost] = np.maximum(capture_loss[lost], distance + 1)
+                schedule_losses(lost)
+    return values
+
+
+def write_table(path, material, values):
+    """
+    Takes as a parameter the file path, the material tuple and its values array
+    Writes the table file
+    """
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(material), bytes(material)))
+        file.write(values.tobytes())
+
+
+def read_table(path, material):
+    """
+    Takes as a parameter the file path and the material tuple it should hold
+    Returns the table's values as a read-only memory-mapped uint8 array
+    """
+    import numpy as np
+
+    with open(path, 'rb') as file:
+        magic, version, count, codes = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC or version != VERSION or tuple(codes[:count]) != material:
+        raise ValueError(f'{path} is not a table for {material_name(material)}')
+    return np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER.size)
+
+
+def generate(material, directory, log=None):
+    """
+    Takes as a parameter a material tuple, the tablebase directory and optionally a function to report progress to
+    Builds the material's table and every smaller table it needs that isn't in the directory yet
+    Returns the table's values
+    """
+    path = table_path(directory, material)
+    if os.path.exists(path):
+        return read_table(path, material)
+
+    smaller = {smaller_material: generate(smaller_material, directory, log)
+               for smaller_material in _smaller_materials(material)}
+    begin = time.perf_counter()
+    values = build_table(material, smaller)
+    os.makedirs(directory, exist_ok=True)
+    write_table(path, material, values)
+    if log is not None:
+        log(material, values, time.perf_counter() - begin)
+    return values
+
+
+def _report(material, values, elapsed):
+    """
+    Prints a summary of a table that was just built
+    """
+    import numpy as np
+
+    decided = values[values > 0]
+    wins = int(np.count_nonzero(decided % 2))
+    print(f'{material_name(material):>8}: {values.size:>12,} positions in {elapsed:6.1f}s, {wins:,} won and '
+          f'{decided.size - wins:,} lost by the player to move, longest {int(decided.max(initial=0))} plies')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build ChessVar endgame tablebases.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    generate_parser = subparsers.add_parser('generate', help='build tables and every smaller table they need')
+    generate_parser.add_argument('materials', nargs='*', help='table names such as qkvrk')
+    generate_parser.add_argument('--pieces', type=int, help='build every table with up to this many pieces')
+    generate_parser.add_argument('--directory', default='tablebases')
+    args = parser.parse_args()
+
+    try:
+        materials = [parse_material(name) for name in args.materials]
+    except ValueError as error:
+        parser.error(str(error))
+    if args.pieces is not None:
+        if not 2 <= args.pieces <= MAX_PIECES:
+            parser.error(f'--pieces must be between 2 and {MAX_PIECES}')
+        materials += all_materials(args.pieces)
+    if not materials:
+        parser.error('give table names or --pieces')
+
+    for material in materials:
+        generate(material, args.directory, _report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Description: Differential test of the move rules. Every backend is asked about all 4096 start and end square pairs
+#               in the perft reference positions and the positions one ply after them, and must give the same
+#               move_error answers and legal move lists as ChessVar. Run with "python -m unittest" from the top level.
+
+import unittest
+
+from ChessVar import ChessVar, SQUARE_NAMES
+from attacks import AttackMapChessVar
+from bitboard import BitboardChessVar
+from perft import REFERENCE_POSITIONS, load_position
+from session import GameSession
+
+BACKENDS = (BitboardChessVar, AttackMapChessVar, GameSession)
+
+
+def positions():
+    """
+    Yields (description, moves) for every reference position and every position one legal move after it
+    """
+    for name, position in REFERENCE_POSITIONS.items():
+        moves = position['moves'].split()
+        yield name, moves
+        for start, end in load_position(name).legal_moves():
+            yield f'{name} {start}{end}', moves + [start + end]
+
+
+def play(game_class, moves):
+    """
+    Takes as a parameter a game class and a list of moves such as e2e4
+    Returns a new game of the class with the moves played
+    """
+    game = game_class()
+    for move in moves:
+        if not game.make_move(move[:2], move[2:]):
+            raise ValueError(f'{game_class.__name__} rejected {move}')
+    return game
+
+
+def move_errors(game):
+    """
+    Takes as a parameter a game
+    Returns a list of the move_error answer for every start and end square pair
+    """
+    return [game.move_error(start, end) for start in SQUARE_NAMES for end in SQUARE_NAMES]
+
+
+class MoveRulesTest(unittest.TestCase):
+
+    def test_backends_agree(self):
+        for description, moves in positions():
+            expected_game = play(ChessVar, moves)
+            expected_errors = move_errors(expected_game)
+            expected_moves = set(expected_game.legal_moves())
+            # legal_moves must list exactly the pairs move_error accepts
+            self.assertEqual(expected_moves, {(start, end) for start in SQUARE_NAMES for end in SQUARE_NAMES
+                                              if expected_game.move_error(start, end) is None}, description)
+            for game_class in BACKENDS:
+                with self.subTest(position=description, backend=game_class.__name__):
+                    game = play(game_class, moves)
+                    self.assertEqual(move_errors(game), expected_errors)
+                    self.assertEqual(set(game.legal_moves()), expected_moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
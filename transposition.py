@@ -0,0 +1,81 @@
+# Author: Monica Cao
+# GitHub username: monica-c-25
+# Date: 10/18/26
+# Description: Fixed size transposition table keyed by ChessVar.position_key(). Entries are packed into typed arrays so
+#               the table never grows past its memory cap, and a slot is only replaced by an equal or deeper search.
+
+from array import array
+
+from ChessVar import SQUARE_INDEX, SQUARE_NAMES
+
+# kinds of stored values
+EXACT = 0
+LOWER_BOUND = 1     # the search failed high, the true value is at least the stored value
+UPPER_BOUND = 2     # the search failed low, the true value is at most the stored value
+
+NO_MOVE = 0xFFFF
+
+# bytes per entry: 8 for the key, 1 for the depth, 1 for the flag, 4 for the value and 2 for the move
+ENTRY_BYTES = 16
+
+
+class TranspositionTable:
+    """
+    This class represents a transposition table with a fixed number of slots.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        """
+        Takes as a parameter the most memory in bytes the table may use, 16 MB unless given
+        """
+        self._size = max(1, max_bytes // ENTRY_BYTES)
+        self._keys = array('Q', bytes(8 * self._size))
+        self._depths = array('b', [-1]) * self._size     # a depth of -1 marks an empty slot
+        self._flags = array('B', bytes(self._size))
+        self._values = array('i', bytes(4 * self._size))
+        self._moves = array('H', [NO_MOVE]) * self._size
+
+    def __len__(self):
+        """
+        Returns the number of slots, which is fixed when the table is made
+        """
+        return self._size
+
+    def probe(self, key):
+        """
+        Takes as a parameter a position key
+        Returns a (depth, value, flag, move) tuple for the position, or None if the position isn't stored
+        move is a (start, end) tuple of squares or None
+        """
+        slot = key % self._size
+        if self._depths[slot] < 0 or self._keys[slot] != key:
+            return None
+
+        move = self._moves[slot]
+        if move == NO_MOVE:
+            move = None
+        else:
+            move = (SQUARE_NAMES[move >> 6], SQUARE_NAMES[move & 63])
+        return self._depths[slot], self._values[slot], self._flags[slot], move
+
+    def store(self, key, depth, value, flag, move=None):
+        """
+        Takes as a parameter a position key, the depth searched, the value found, the kind of value and the best move
+        Stores the entry unless its slot holds a different position searched to a greater depth
+        """
+        slot = key % self._size
+        if self._keys[slot] != key and self._depths[slot] > depth:
+            return
+
+        self._keys[slot] = key
+        self._depths[slot] = min(depth, 127)
+        self._flags[slot] = flag
+        self._values[slot] = value
+        self._moves[slot] = NO_MOVE if move is None else SQUARE_INDEX[move[0]] << 6 | SQUARE_INDEX[move[1]]
+
+    def clear(self):
+        """
+        Empties every slot
+        """
+        for slot in range(self._size):
+            self._depths[slot] = -1